@@ -0,0 +1,4 @@
+window.MEDIA_MANIFEST = {
+  "media": {},
+  "version": 1
+};
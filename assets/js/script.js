@@ -22,6 +22,63 @@ navLinks.forEach(btn => {
 });
 
 
+/*-----------------------------------*\
+  #MEDIA ENTRIES
+\*-----------------------------------*/
+// Un média est un chemin, ou (export `--enrich` de l'éditeur) un objet
+// { src, width, height, bytes, variants: [{ src, type, width, height }], placeholder }.
+// Pour un simple chemin, les variantes viennent du manifest généré par
+// `python editor/cli.py derive` (assets/data/media-manifest.js) s'il le connaît.
+const mediaSrc = (m) => String((m && typeof m === 'object') ? (m.src || '') : (m || ''));
+
+const mediaEntry = (m) => {
+  const src = mediaSrc(m);
+  if (m && typeof m === 'object') {
+    return { src, width: m.width, height: m.height, variants: m.variants || [], placeholder: m.placeholder };
+  }
+  const media = window.MEDIA_MANIFEST && window.MEDIA_MANIFEST.media;
+  const at = src.indexOf('assets/');
+  const entry = media && at >= 0 ? media[src.slice(at)] : null;
+  if (!entry) return { src, variants: [] };
+
+  // Préfixe d'origine ("./", URL raw GitHub...) conservé pour les dérivés
+  const prefix = src.slice(0, at);
+  return {
+    src,
+    width: entry.width,
+    height: entry.height,
+    variants: (entry.variants || []).map(v => ({ ...v, src: prefix + v.src })),
+    placeholder: entry.placeholder
+  };
+};
+
+// srcset d'un type de variante ; l'original complète la liste des <img>
+const variantSrcset = (e, type) => {
+  const list = e.variants.filter(v => v.type === type).map(v => `${v.src} ${v.width}w`);
+  if (list.length && !type.endsWith('avif') && e.width) list.push(`${e.src} ${e.width}w`);
+  return list.join(', ');
+};
+
+// Aperçu flou (data URI) peint en fond de l'<img> jusqu'au chargement de l'image
+const placeholderStyle = (uri) => `background-image:url('${uri}');background-size:cover;background-position:center`;
+const clearPlaceholder = (img) => { img.style.backgroundImage = ''; };
+
+// <img> avec dimensions intrinsèques, srcset et aperçu, dans un <picture> s'il existe de l'AVIF
+const imageHTML = (m, attrs, sizes) => {
+  const e = mediaEntry(m);
+  const dims = e.width && e.height ? ` width="${e.width}" height="${e.height}"` : '';
+  const lqip = e.placeholder
+    ? ` style="${placeholderStyle(e.placeholder)}" onload="this.style.backgroundImage=''"`
+    : '';
+  const webp = variantSrcset(e, 'image/webp');
+  const avif = variantSrcset(e, 'image/avif');
+  const srcset = webp ? ` srcset="${webp}" sizes="${sizes}"` : '';
+  const img = `<img src="${e.src}"${srcset}${dims}${lqip} ${attrs}>`;
+  if (!avif) return img;
+  return `<picture><source type="image/avif" srcset="${avif}" sizes="${sizes}">${img}</picture>`;
+};
+
+
 /*-----------------------------------*\
   #PROJECT DETAIL LOADER
 \*-----------------------------------*/
@@ -181,7 +238,8 @@ navLinks.forEach(btn => {
     const box = document.createElement('div');
     box.className = 'project-thumbs has-scrollbar';
 
-    medias.forEach(src => {
+    medias.forEach(m => {
+      const src = mediaSrc(m);
       const btn = document.createElement('button');
       btn.className = 'thumb-btn';
       btn.setAttribute('aria-label', isVideo(src) ? 'Voir la vidéo' : 'Voir l’image');
@@ -203,7 +261,7 @@ navLinks.forEach(btn => {
 
         btn.addEventListener('click', () => openModalMedia(src));
       } else {
-        btn.innerHTML = `<img src="${src}" alt="Miniature" class="thumb-media">`;
+        btn.innerHTML = imageHTML(m, 'alt="Miniature" class="thumb-media" loading="lazy"', '160px');
         btn.addEventListener('click', () => openModalMedia(src));
       }
 
@@ -220,7 +278,8 @@ navLinks.forEach(btn => {
     el.title.textContent = project.title || '';
     el.desc.innerHTML = parseDescription(project.description || '');
 
-    const heroSrc = project.media || project.image || null;
+    const hero = project.media || project.image || null;
+    const heroSrc = hero ? mediaSrc(hero) : null;
 
     const oldVid = el.heroWrap.querySelector('video');
     if (oldVid) oldVid.remove();
@@ -238,7 +297,32 @@ navLinks.forEach(btn => {
         el.heroWrap.appendChild(v);
         el.heroWrap.style.display = '';
       } else {
+        const e = mediaEntry(hero);
+        const webp = variantSrcset(e, 'image/webp');
+        // Placeholder first: it must be painted before the image starts loading
+        if (e.placeholder) {
+          el.heroImg.style.backgroundImage = `url('${e.placeholder}')`;
+          el.heroImg.style.backgroundSize = 'cover';
+          el.heroImg.style.backgroundPosition = 'center';
+          el.heroImg.addEventListener('load', () => clearPlaceholder(el.heroImg), { once: true });
+        } else {
+          clearPlaceholder(el.heroImg);
+        }
+        if (webp) {
+          el.heroImg.srcset = webp;
+          el.heroImg.sizes = '100vw';
+        } else {
+          el.heroImg.removeAttribute('srcset');
+          el.heroImg.removeAttribute('sizes');
+        }
         el.heroImg.src = heroSrc;
+        if (e.width && e.height) {
+          el.heroImg.width = e.width;
+          el.heroImg.height = e.height;
+        } else {
+          el.heroImg.removeAttribute('width');
+          el.heroImg.removeAttribute('height');
+        }
         el.heroImg.style.display = '';
         el.heroWrap.style.display = '';
       }
@@ -421,12 +505,14 @@ navLinks.forEach(btn => {
     const catLabel = p.category || 'Autres';
     const catSlug  = slug(catLabel);
     const thumb    = pickThumb(p);
-    const isVid    = isVideo(thumb);
+    const thumbSrc = mediaSrc(thumb);
+    const isVid    = isVideo(thumbSrc);
     const title    = p.title || p.id || 'Projet';
 
     const mediaHTML = isVid
-      ? `<video src="${thumb}" muted playsinline preload="metadata" class="thumb-video"></video>`
-      : `<img src="${thumb}" alt="${escapeHtml(title)}" loading="lazy">`;
+      ? `<video src="${thumbSrc}" muted playsinline preload="metadata" class="thumb-video"></video>`
+      : imageHTML(thumb, `alt="${escapeHtml(title)}" loading="lazy"`,
+        '(min-width: 1024px) 33vw, (min-width: 580px) 50vw, 100vw');
 
     return `
 <li class="project-item active" data-filter-item data-category="${catSlug}" data-project-id="${p.id}">
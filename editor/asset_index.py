@@ -0,0 +1,203 @@
+import os
+import posixpath
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+
+class AssetInfo(NamedTuple):
+    size: int
+    mtime_ns: int
+
+
+class AssetIndex:
+    """
+    Index en mémoire des fichiers d'un dossier d'assets.
+
+    Les chemins sont stockés relatifs à `base` (la racine du site) au format
+    POSIX, tels qu'ils apparaissent dans projects-data.js
+    ("assets/projects/..."), avec leur taille et leur mtime.
+    Le premier scan peut tourner dans un thread (`start()`), et `refresh()`
+    ne relit que les dossiers dont le mtime a changé. Un fichier modifié sur
+    place ne change pas le mtime de son dossier : les fichiers des autres
+    dossiers sont donc re-stat, pour que tailles et mtimes restent exacts.
+    """
+
+    # A lookup miss refreshes the index at most this often (seconds): a file
+    # full of missing media must not walk the tree once per bad path
+    MISS_REFRESH_INTERVAL = 2.0
+
+    def __init__(self, root, base=None):
+        self.root = Path(root).resolve()
+        self.base = Path(base).resolve() if base is not None else self.root.parent
+        self.prefix = self.root.relative_to(self.base).as_posix()
+        self._files: dict[str, AssetInfo] = {}
+        # relative dir -> (mtime_ns, [(name, size, mtime_ns)], sub-directory names)
+        self._dirs: dict[str, tuple[int, list[tuple[str, int, int]], list[str]]] = {}
+        self._refreshed_at = float("-inf")
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # ---- Scanning ----
+    def start(self) -> threading.Thread:
+        """Lance le premier scan dans un thread d'arrière-plan."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.refresh, name="asset-index", daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Attend la fin du premier scan."""
+        if self._thread is None and not self._ready.is_set():
+            self.refresh()
+        return self._ready.wait(timeout)
+
+    def refresh(self, workers: int = 1) -> int:
+        """
+        Met l'index à jour : seuls les dossiers dont le mtime a changé sont relus,
+        les fichiers des autres sont seulement re-stat. Avec `workers` > 1, les
+        dossiers d'un même niveau sont traités en parallèle.
+        Retourne le nombre de dossiers relus ou dont un fichier a changé.
+        """
+        with self._lock:
+            old_dirs = self._dirs
+            files: dict[str, AssetInfo] = {}
+            dirs: dict[str, tuple[int, list[tuple[str, int, int]], list[str]]] = {}
+            rescanned = 0
+            pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+            try:
+                level = [self.prefix]
+                while level:
+                    listings = (pool.map if pool else map)(lambda d: self._scan_dir(d, old_dirs), level)
+                    next_level = []
+                    for rel_dir, listing in zip(level, listings):
+                        if listing is None:
+                            continue
+                        if listing is not old_dirs.get(rel_dir):
+                            rescanned += 1
+                        dirs[rel_dir] = listing
+                        for name, size, mtime_ns in listing[1]:
+                            files[f"{rel_dir}/{name}"] = AssetInfo(size, mtime_ns)
+                        next_level.extend(f"{rel_dir}/{name}" for name in listing[2])
+                    level = next_level
+            finally:
+                if pool is not None:
+                    pool.shutdown()
+            # Readers keep working on the previous dicts until this swap
+            self._files, self._dirs = files, dirs
+            self._refreshed_at = time.monotonic()
+        self._ready.set()
+        return rescanned
+
+    def _scan_dir(self, rel_dir: str, old_dirs: dict):
+        # (mtime_ns, [(name, size, mtime_ns)], sub-directory names), the cached
+        # listing itself if nothing changed, None if unreadable
+        abs_dir = os.path.join(self.base, rel_dir)
+        try:
+            mtime = os.stat(abs_dir).st_mtime_ns
+        except OSError:
+            return None
+        cached = old_dirs.get(rel_dir)
+        if cached is not None and cached[0] == mtime:
+            # Same names, but a file rewritten in place keeps the directory
+            # mtime: one stat per file, still much cheaper than scandir
+            files = []
+            for name, size, mtime_ns in cached[1]:
+                try:
+                    st = os.stat(os.path.join(abs_dir, name))
+                except OSError:
+                    continue
+                files.append((name, st.st_size, st.st_mtime_ns))
+            return cached if files == cached[1] else (mtime, files, cached[2])
+        files, subdirs = [], []
+        try:
+            with os.scandir(abs_dir) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir():
+                            subdirs.append(entry.name)
+                        elif entry.is_file():
+                            st = entry.stat()
+                            files.append((entry.name, st.st_size, st.st_mtime_ns))
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+        return mtime, files, subdirs
+
+    def state(self) -> dict:
+        """Listings des dossiers (types simples, sérialisables), pour restore()."""
+        self.wait()
+        return self._dirs
+
+    def restore(self, state: dict):
+        """
+        Reprend les listings d'un state() précédent (cache sur disque) : le
+        refresh suivant ne relit que les dossiers modifiés depuis. Sans effet
+        sur un index déjà rempli.
+        """
+        with self._lock:
+            if not self._dirs:
+                self._dirs = state
+
+    # ---- Lookups ----
+    def normalize(self, path) -> str | None:
+        """
+        Normalise un chemin (relatif à `base`, ou absolu) en chemin relatif
+        POSIX. Retourne None s'il n'est pas situé dans le dossier indexé.
+        """
+        s = str(path).strip().replace("\\", "/")
+        if not s:
+            return None
+        if os.path.isabs(s):
+            try:
+                s = Path(s).resolve().relative_to(self.base).as_posix()
+            except ValueError:
+                return None
+        s = posixpath.normpath(s)
+        if not s.startswith(self.prefix + "/"):
+            return None
+        return s
+
+    def lookup(self, path, fresh: bool = False) -> str | None:
+        """
+        Retourne le chemin normalisé si c'est un fichier indexé, sinon None.
+        Un chemin absent déclenche un refresh incrémental (fichier ajouté
+        depuis le dernier scan), au plus une fois par MISS_REFRESH_INTERVAL :
+        entre-temps, une absence est tenue pour acquise jusqu'au refresh
+        suivant. `fresh` force le refresh (fichier qu'on sait existant,
+        choisi dans un dialogue).
+        """
+        rel = self.normalize(path)
+        if rel is None:
+            return None
+        self.wait()
+        if rel in self._files:
+            return rel
+        if not fresh and time.monotonic() - self._refreshed_at < self.MISS_REFRESH_INTERVAL:
+            return None
+        self.refresh()
+        return rel if rel in self._files else None
+
+    def get(self, rel_path: str) -> AssetInfo | None:
+        self.wait()
+        return self._files.get(rel_path)
+
+    def __contains__(self, rel_path: str) -> bool:
+        self.wait()
+        return rel_path in self._files
+
+    def __len__(self) -> int:
+        self.wait()
+        return len(self._files)
+
+    def paths(self, under: str | None = None) -> list[str]:
+        """Chemins indexés, éventuellement limités à un sous-dossier."""
+        self.wait()
+        if under is None:
+            return list(self._files)
+        under = under.rstrip("/") + "/"
+        return [p for p in self._files if p.startswith(under)]
@@ -0,0 +1,108 @@
+"""
+Audit des références de médias de projects-data.js contre ./assets :
+fichiers manquants, différences de casse (.PNG / .png, invisibles sous
+Windows mais cassées sur un serveur sensible à la casse) et fichiers que
+plus aucun projet ne référence.
+
+Les fichiers viennent de l'index des assets (AssetIndex), rafraîchi sur un
+pool de threads ; le contenu de chaque dossier est mis en cache dans
+.cache/ par mtime : un dossier inchangé n'est pas relu au passage suivant.
+"""
+
+import hashlib
+import os
+import posixpath
+import unicodedata
+from pathlib import Path
+from typing import NamedTuple
+
+from asset_index import AssetIndex
+from core import ASSET_INDEX, CACHE_DIR, iter_media_paths, load_cache, save_cache
+
+_SCAN_CACHE_VERSION = 2
+
+
+class Reference(NamedTuple):
+    project: str
+    where: str
+    path: str
+
+
+class AuditReport(NamedTuple):
+    files: dict            # rel path -> (size, mtime_ns)
+    references: list       # Reference
+    missing: list          # Reference
+    case_mismatches: list  # (Reference, actual path on disk)
+    outside: list          # Reference not under ./assets
+    unreferenced: list     # rel path
+
+    @property
+    def broken(self) -> bool:
+        return bool(self.missing or self.case_mismatches or self.outside)
+
+
+def _scan_cache_path(root: Path) -> Path:
+    tag = hashlib.blake2b(str(root).encode("utf-8"), digest_size=4).hexdigest()
+    return CACHE_DIR / f"audit-{tag}.marshal"
+
+
+def scan_tree(index: AssetIndex = ASSET_INDEX, under: str | None = None,
+              workers: int | None = None, cache: bool = True) -> dict:
+    """
+    Fichiers de l'index (ou de son sous-dossier `under`), en chemins POSIX
+    relatifs à la racine du site, avec leur (taille, mtime_ns). L'index est
+    rafraîchi sur un pool de threads ; ses listings de dossiers sont gardés
+    dans .cache/, si bien qu'un dossier inchangé n'est pas relu au passage
+    suivant.
+    """
+    cache_path = _scan_cache_path(index.root)
+    old_dirs = load_cache(cache_path, _SCAN_CACHE_VERSION, {}) if cache else {}
+    index.restore(old_dirs)
+    index.refresh(workers or min(32, (os.cpu_count() or 1) * 4))
+    if cache and index.state() != old_dirs:
+        save_cache(cache_path, _SCAN_CACHE_VERSION, index.state())
+    return {path: index.get(path) for path in index.paths(under)}
+
+
+def _fold(path: str) -> str:
+    # Case-insensitive, and NFC so that names written on macOS (NFD) match
+    return unicodedata.normalize("NFC", path).casefold()
+
+
+def collect_references(data: dict) -> list[Reference]:
+    return [
+        Reference(str(proj.get("id", "?")), where, path)
+        for proj in data.get("projects", [])
+        for where, path in iter_media_paths(proj)
+        if path
+    ]
+
+
+def audit(data: dict, unreferenced_under: str | None = "assets/projects",
+          workers: int | None = None, cache: bool = True) -> AuditReport:
+    """Confronte les références de `data` aux fichiers de ./assets."""
+    files = scan_tree(workers=workers, cache=cache)
+    by_folded: dict[str, str] = {}
+    for path in files:
+        by_folded.setdefault(_fold(path), path)
+
+    references = collect_references(data)
+    missing, mismatches, outside, used = [], [], [], set()
+    for ref in references:
+        rel = ASSET_INDEX.normalize(ref.path)
+        if rel is None:
+            outside.append(ref)
+        elif rel in files:
+            used.add(rel)
+        elif _fold(rel) in by_folded:
+            actual = by_folded[_fold(rel)]
+            mismatches.append((ref, actual))
+            used.add(actual)
+        else:
+            missing.append(ref)
+
+    unreferenced = []
+    if unreferenced_under is not None:
+        scope = posixpath.normpath(unreferenced_under.replace("\\", "/")).rstrip("/") + "/"
+        unreferenced = sorted(p for p in files if p.startswith(scope) and p not in used)
+    return AuditReport(files, references, missing, mismatches, outside, unreferenced)
@@ -0,0 +1,51 @@
+"""
+Benchmark de l'écriture de projects-data.js : chaîne complète
+(dump_projects_js + write) contre l'écriture en streaming de
+save_projects_file. Vérifie aussi que les deux fichiers sont identiques.
+
+    python editor/benchmarks/bench_dump.py [--projects 1000 4000 8000]
+"""
+
+import argparse
+import filecmp
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_parse import best_of, peak_memory, synthetic_data  # noqa: E402
+from core import dump_projects_js, save_projects_file  # noqa: E402
+
+
+def legacy_save(data: dict, path):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(dump_projects_js(data))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--projects", type=int, nargs="+", default=[1000, 4000, 8000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'projets':>8} {'taille':>9} {'ancien':>9} {'nouveau':>9} {'pic ancien':>11} {'pic nouveau':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        old_path = os.path.join(tmp, "old.js")
+        new_path = os.path.join(tmp, "new.js")
+        for n in args.projects:
+            data = synthetic_data(n)
+            legacy_save(data, old_path)
+            save_projects_file(data, new_path)
+            assert filecmp.cmp(old_path, new_path, shallow=False), "sortie différente"
+            old = best_of(lambda: legacy_save(data, old_path), args.repeat)
+            new = best_of(lambda: save_projects_file(data, new_path), args.repeat)
+            old_peak = peak_memory(lambda: legacy_save(data, old_path))
+            new_peak = peak_memory(lambda: save_projects_file(data, new_path))
+            size = os.path.getsize(new_path) / 1e6
+            print(f"{n:>8} {size:>7.1f}MB {old * 1000:>7.1f}ms {new * 1000:>7.1f}ms"
+                  f" {old_peak:>9.1f}MB {new_peak:>10.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
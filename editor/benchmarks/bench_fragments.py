@@ -0,0 +1,87 @@
+"""
+Vérifie et mesure le cache de fragments (FragmentCache) : après des
+modifications aléatoires (champ, section, ajout, duplication, suppression,
+clé hors projets), le fichier assemblé à partir des fragments doit être
+identique octet pour octet à dump_projects_js. Affiche ensuite le temps
+d'une resauvegarde complète contre une resauvegarde après un seul
+projet modifié.
+
+    python editor/benchmarks/bench_fragments.py [--projects 4000] [--rounds 200]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_parse import best_of, synthetic_data  # noqa: E402
+from core import FragmentCache, assemble_projects_js, dump_projects_js  # noqa: E402
+
+
+def mutate(data: dict, cache: FragmentCache, rng: random.Random):
+    projects = data["projects"]
+    op = rng.choice(["field", "section", "add", "duplicate", "delete", "meta"])
+    if op == "meta":
+        data["version"] = rng.randrange(1000)
+        return
+    if op == "add" or not projects:
+        proj = {"id": f"nouveau-{rng.randrange(1 << 30)}", "title": "Nouveau « projet »", "sections": []}
+        cache.touch(proj)
+        projects.insert(rng.randrange(len(projects) + 1), proj)
+        return
+    i = rng.randrange(len(projects))
+    proj = projects[i]
+    if op == "field":
+        proj["title"] = f"Titre {rng.random()} é\n\"x\""
+    elif op == "section":
+        proj.setdefault("sections", []).append({"title": "S", "description": "", "medias": ["a/b.png"]})
+    elif op == "duplicate":
+        clone = json.loads(json.dumps(proj))
+        cache.touch(clone)
+        projects.insert(i + 1, clone)
+        return
+    elif op == "delete":
+        del projects[i]
+    cache.touch(proj)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--projects", type=int, default=4000)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cache = FragmentCache()
+    for data in ({}, {"projects": []}, {"meta": {"a": [1, {}]}, "projects": [], "z": None}):
+        assert assemble_projects_js(data, cache.fragments(data.get("projects", []))) == dump_projects_js(data)
+
+    data = {"version": 1, **synthetic_data(200), "extra": {"liste": [1, 2], "vide": {}}}
+    for _ in range(args.rounds):
+        for _ in range(rng.randrange(1, 4)):
+            mutate(data, cache, rng)
+        assert assemble_projects_js(data, cache.fragments(data["projects"])) == dump_projects_js(data)
+    print(f"{args.rounds} sauvegardes après modifications aléatoires : sortie identique")
+
+    data = synthetic_data(args.projects)
+    cache = FragmentCache()
+    cache.fragments(data["projects"])
+
+    def resave_one():
+        proj = data["projects"][rng.randrange(len(data["projects"]))]
+        proj["title"] += "!"
+        cache.touch(proj)
+        assemble_projects_js(data, cache.fragments(data["projects"]))
+
+    full = best_of(lambda: dump_projects_js(data), 3)
+    cached = best_of(resave_one, 3)
+    print(f"{args.projects} projets : complet {full * 1000:.1f}ms, un projet modifié {cached * 1000:.1f}ms"
+          f" ({full / cached:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
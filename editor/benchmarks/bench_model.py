@@ -0,0 +1,69 @@
+"""
+Benchmark du modèle à __slots__ (model.Project/Section) contre les dict
+bruts : mémoire des projets chargés, coût des copies (aller-retour JSON
+d'avant contre copy()) et de la sérialisation, sur un fichier synthétique.
+Vérifie aussi que la sortie de dump_projects_js est identique.
+
+    python editor/benchmarks/bench_model.py [--projects 5000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_parse import best_of, synthetic_data  # noqa: E402
+from core import dump_projects_js, load_projects_file  # noqa: E402
+from model import to_model  # noqa: E402
+
+
+def retained_memory(func) -> tuple[object, float]:
+    """Mémoire (Mo) encore allouée par le résultat de `func` après l'appel."""
+    tracemalloc.start()
+    result = func()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, current / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--projects", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "projects.js")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(dump_projects_js(synthetic_data(args.projects)))
+        size = os.path.getsize(path) / 1e6
+
+        plain, plain_mem = retained_memory(lambda: load_projects_file(path))
+        model, model_mem = retained_memory(lambda: to_model(load_projects_file(path)))
+        assert dump_projects_js(model) == dump_projects_js(plain)
+
+    projects, nodes = plain["projects"], model["projects"]
+    rows = [
+        ("mémoire des données", f"{plain_mem:.1f}MB", f"{model_mem:.1f}MB"),
+        ("dupliquer tous les projets",
+         f"{best_of(lambda: [json.loads(json.dumps(p)) for p in projects], args.repeat) * 1000:.1f}ms",
+         f"{best_of(lambda: [p.copy() for p in nodes], args.repeat) * 1000:.1f}ms"),
+        ("copier toutes les sections",
+         f"{best_of(lambda: [[json.loads(json.dumps(s)) for s in p['sections']] for p in projects], args.repeat) * 1000:.1f}ms",
+         f"{best_of(lambda: [[dict(s) for s in p['sections']] for p in nodes], args.repeat) * 1000:.1f}ms"),
+        ("dump_projects_js",
+         f"{best_of(lambda: dump_projects_js(plain), args.repeat) * 1000:.1f}ms",
+         f"{best_of(lambda: dump_projects_js(model), args.repeat) * 1000:.1f}ms"),
+    ]
+    print(f"{args.projects} projets, {size:.1f}MB")
+    print(f"{'':<28} {'dict':>10} {'modèle':>10}")
+    for name, old, new in rows:
+        print(f"{name:<28} {old:>10} {new:>10}")
+
+
+if __name__ == "__main__":
+    main()
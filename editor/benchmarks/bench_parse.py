@@ -0,0 +1,110 @@
+"""
+Benchmark du chargement de projects-data.js : parse_projects_js actuel
+contre l'ancienne version (regex DOTALL sur tout le fichier + json.loads).
+
+    python editor/benchmarks/bench_parse.py [--projects 1000 4000 8000] [--stdlib]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import core  # noqa: E402
+from core import dump_projects_js, load_projects_file  # noqa: E402
+
+_LEGACY_RE = re.compile(
+    r"""^\s*window\s*\.\s*PROJECTS_DATA\s*=\s*(\{.*\})\s*;?\s*$""",
+    re.DOTALL,
+)
+
+
+def legacy_parse_projects_js(text: str) -> dict:
+    m = _LEGACY_RE.match(text)
+    if not m:
+        raise ValueError("format")
+    return json.loads(m.group(1))
+
+
+def legacy_load(path) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return legacy_parse_projects_js(f.read())
+
+
+def synthetic_data(n_projects: int) -> dict:
+    desc = "Description du projet, avec des accents éàü et [url=https://example.com]un lien[/url].\n" * 8
+    return {"projects": [
+        {
+            "id": f"projet-{i}",
+            "title": f"Projet {i}",
+            "category": "Game Development",
+            "icon": f"assets/projects/p{i}/icon.png",
+            "media": f"assets/projects/p{i}/main.png",
+            "description": desc,
+            "sections": [
+                {
+                    "title": f"Section {j}",
+                    "description": desc,
+                    "medias": [f"assets/projects/p{i}/s{j}/{k}.png" for k in range(6)],
+                }
+                for j in range(3)
+            ],
+            "medias": [f"assets/projects/p{i}/galerie/{k}.png" for k in range(10)],
+        }
+        for i in range(n_projects)
+    ]}
+
+
+def best_of(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def peak_memory(func) -> float:
+    """Pic d'allocations Python (Mo) pendant un appel."""
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--projects", type=int, nargs="+", default=[1000, 4000, 8000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--stdlib", action="store_true", help="ignore orjson even if installed")
+    args = parser.parse_args()
+    if args.stdlib:
+        core.orjson = None
+
+    backend = "orjson" if core.orjson is not None else "json (stdlib)"
+    print(f"backend: {backend}")
+    print(f"{'projets':>8} {'taille':>9} {'ancien':>9} {'nouveau':>9} {'gain':>6} {'pic ancien':>11} {'pic nouveau':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.projects:
+            path = os.path.join(tmp, f"projects-{n}.js")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(dump_projects_js(synthetic_data(n)))
+            assert load_projects_file(path) == legacy_load(path)
+            old = best_of(lambda: legacy_load(path), args.repeat)
+            new = best_of(lambda: load_projects_file(path), args.repeat)
+            old_peak = peak_memory(lambda: legacy_load(path))
+            new_peak = peak_memory(lambda: load_projects_file(path))
+            size = os.path.getsize(path) / 1e6
+            print(f"{n:>8} {size:>7.1f}MB {old * 1000:>7.1f}ms {new * 1000:>7.1f}ms {old / new:>5.2f}x"
+                  f" {old_peak:>9.1f}MB {new_peak:>10.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark du démarrage à froid, avec et sans le cache de parsing (.cache/).
+
+Chaque mesure lance un nouveau processus Python. Avec un affichage
+disponible, on mesure le temps jusqu'à la première frame interactive de
+l'éditeur (premier after_idle après la construction de la fenêtre) ;
+sinon (--no-gui, ou pas de $DISPLAY), le temps jusqu'aux données chargées.
+
+    python editor/benchmarks/bench_startup.py [--projects 5000] [--runs 5] [--no-gui] [--stdlib]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+EDITOR_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, EDITOR_DIR)
+
+from bench_parse import synthetic_data  # noqa: E402
+from core import dump_projects_js  # noqa: E402
+
+# Child process: `t0` is taken before any import of the editor modules
+_LOAD = """
+import sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, {editor_dir!r})
+import core
+from model import to_model
+if {stdlib}:
+    core.orjson = None
+if {cached}:
+    data, _ = core.load_projects_cached({path!r}, {cache_dir!r})
+else:
+    data = core.load_projects_file({path!r})
+to_model(data)
+print(time.perf_counter() - t0)
+"""
+
+_GUI = """
+import sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, {editor_dir!r})
+import core, editor, journal, shards
+if {stdlib}:
+    core.orjson = None
+if not {cached}:
+    editor.load_projects_cached = lambda path: (core.load_projects_file(path), core.file_hash(path))
+else:
+    editor.load_projects_cached = lambda path: core.load_projects_cached(path, {cache_dir!r})
+editor.PROJECTS_JSON = {path!r}
+editor.Journal = lambda: journal.Journal({journal_path!r})
+editor.ShardStore = lambda: shards.ShardStore({shards_dir!r})
+app = editor.ProjectsEditor()
+def ready():
+    print(time.perf_counter() - t0)
+    app.destroy()
+app.after_idle(ready)
+app.mainloop()
+"""
+
+
+def run(code: str) -> float:
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--projects", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--no-gui", action="store_true")
+    parser.add_argument("--stdlib", action="store_true", help="ignore orjson even if installed")
+    args = parser.parse_args()
+    gui = not args.no_gui and (os.name == "nt" or bool(os.environ.get("DISPLAY")))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "projects-data.js")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(dump_projects_js(synthetic_data(args.projects)))
+        size = os.path.getsize(path) / 1e6
+        params = dict(editor_dir=EDITOR_DIR, stdlib=args.stdlib, path=path, cache_dir=os.path.join(tmp, "cache"),
+                      journal_path=os.path.join(tmp, "journal.jsonl"), shards_dir=os.path.join(tmp, "shards"))
+        template = _GUI if gui else _LOAD
+
+        results = {}
+        for cached in (False, True):
+            code = template.format(cached=cached, **params)
+            if cached:
+                run(code)  # fills the cache
+            results[cached] = [run(code) for _ in range(args.runs)]
+
+    what = "première frame interactive" if gui else "données chargées (sans GUI)"
+    print(f"{args.projects} projets ({size:.1f}MB), temps jusqu'à : {what}")
+    for cached, label in ((False, "sans cache"), (True, "avec cache")):
+        times = results[cached]
+        print(f"  {label:<11} médiane {statistics.median(times) * 1000:7.1f}ms  min {min(times) * 1000:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+Ligne de commande de l'éditeur, sans GUI :
+
+    python editor/cli.py load [fichier]
+    python editor/cli.py validate [fichier]
+    python editor/cli.py audit [fichier] [--under dossier] [--strict]
+    python editor/cli.py derive [fichier] [--workers N] [--no-cache]
+    python editor/cli.py dedupe [fichier] [--under dossier] [-d dossier] [--apply [--delete | --hardlink]]
+    python editor/cli.py similar [fichier] [--threshold N]
+    python editor/cli.py save [fichier] [-o sortie] [--enrich]
+    python editor/cli.py shard [fichier] [-d dossier]
+    python editor/cli.py bundle [-d dossier] [-o sortie] [--enrich]
+    python editor/cli.py gui
+
+tkinter/customtkinter ne sont importés que par la commande `gui`.
+"""
+
+import argparse
+import sys
+import time
+
+from core import PROJECTS_JSON, load_projects_file, save_projects_file
+from shards import SHARDS_DIR, ShardStore
+from validation import ProjectValidator
+
+
+def cmd_load(args) -> int:
+    data = load_projects_file(args.file)
+    projects = data.get("projects", [])
+    sections = sum(len(p.get("sections", [])) for p in projects)
+    medias = sum(
+        len(p.get("medias", [])) + sum(len(s.get("medias", [])) for s in p.get("sections", []))
+        for p in projects
+    )
+    print(f"{args.file}: {len(projects)} projets, {sections} sections, {medias} médias")
+    return 0
+
+
+def cmd_validate(args) -> int:
+    projects = load_projects_file(args.file).get("projects", [])
+    results, _ = ProjectValidator().validate(projects)
+    errors = [
+        f"{p.get('id', '?') if isinstance(p, dict) else f'projects[{i}]'}: {e}"
+        for i, (p, errs) in enumerate(zip(projects, results)) for e in errs
+    ]
+    for err in errors:
+        print(err, file=sys.stderr)
+    print(f"{len(errors)} erreur(s)")
+    return 1 if errors else 0
+
+
+def cmd_audit(args) -> int:
+    from audit import audit
+
+    start = time.perf_counter()
+    report = audit(load_projects_file(args.file), args.under, args.workers, cache=not args.no_cache)
+    for ref in report.missing:
+        print(f"{ref.project}: {ref.where}: fichier introuvable : {ref.path}", file=sys.stderr)
+    for ref, actual in report.case_mismatches:
+        print(f"{ref.project}: {ref.where}: casse différente : {ref.path} -> {actual}", file=sys.stderr)
+    for ref in report.outside:
+        print(f"{ref.project}: {ref.where}: hors de ./assets : {ref.path}", file=sys.stderr)
+    unreferenced_bytes = sum(report.files[p][0] for p in report.unreferenced)
+    for path in report.unreferenced:
+        print(f"non référencé : {path} ({report.files[path][0] / 1e6:.1f} Mo)")
+    print(
+        f"{len(report.files)} fichiers, {len(report.references)} références : "
+        f"{len(report.missing)} manquant(s), {len(report.case_mismatches)} casse(s) différente(s), "
+        f"{len(report.outside)} hors de ./assets, {len(report.unreferenced)} non référencé(s) "
+        f"({unreferenced_bytes / 1e6:.1f} Mo) en {time.perf_counter() - start:.2f}s"
+    )
+    if report.broken or (args.strict and report.unreferenced):
+        return 1
+    return 0
+
+
+def cmd_derive(args) -> int:
+    from derivatives import build_derivatives  # lazy: pulls Pillow
+
+    start = time.perf_counter()
+    try:
+        report = build_derivatives(load_projects_file(args.file), args.workers, cache=not args.no_cache,
+                                   prune=not args.keep)
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 1
+    for path, reason in report.skipped:
+        print(f"ignoré : {path} : {reason}", file=sys.stderr)
+    if report.failed and not args.keep:
+        print(f"{report.failed} image(s) en échec : dérivés obsolètes gardés", file=sys.stderr)
+    variants = [v for e in report.manifest["media"].values() for v in e["variants"]]
+    print(
+        f"{len(report.rendered)} image(s) traitée(s), {len(report.reused)} à jour, "
+        f"{len(report.skipped)} ignorée(s), {len(report.removed)} dérivé(s) obsolète(s) supprimé(s) ; "
+        f"{len(variants)} dérivés ({sum(v['bytes'] for v in variants) / 1e6:.1f} Mo) "
+        f"en {time.perf_counter() - start:.2f}s"
+    )
+    return 0
+
+
+def cmd_dedupe(args) -> int:
+    from dedupe import plan_dedupe, remove_duplicates, rewrite_references
+
+    start = time.perf_counter()
+    # Enriched media are kept as they are: the file is rewritten in place
+    data = load_projects_file(args.file, keep_media=True)
+    groups = plan_dedupe(data, args.under, args.workers, cache=not args.no_cache)
+    for group in groups:
+        print(f"{group.canonical} ({group.size / 1e6:.1f} Mo)")
+        for dup in group.duplicates:
+            print(f"  = {dup}")
+    redundant = sum(len(g.duplicates) for g in groups)
+    wasted = sum(g.size * len(g.duplicates) for g in groups)
+    print(f"{len(groups)} groupe(s), {redundant} copie(s) en trop ({wasted / 1e6:.1f} Mo) "
+          f"en {time.perf_counter() - start:.2f}s")
+    if not args.apply or not groups:
+        return 0
+
+    changed = rewrite_references(data, groups)
+    if changed:
+        save_projects_file(data, args.file)
+    print(f"{args.file}: {changed} référence(s) réécrite(s)")
+    store = ShardStore(args.directory)
+    if store.exists():
+        # The editor loads the shards first: they must not bring the copies back
+        shard_data = store.load()
+        if rewrite_references(shard_data, groups):
+            written = store.save(shard_data)
+            print(f"{args.directory}: {len(written)} fichier(s) écrit(s)")
+    if args.delete or args.hardlink:
+        freed = remove_duplicates(groups, hardlink=args.hardlink)
+        action = "remplacés par des liens physiques" if args.hardlink else "supprimés"
+        print(f"{freed / 1e6:.1f} Mo {action}")
+    return 0
+
+
+def cmd_similar(args) -> int:
+    from similar import find_similar  # lazy: pulls NumPy and Pillow
+
+    start = time.perf_counter()
+    data = load_projects_file(args.file)
+    try:
+        report, skipped = find_similar(data, args.threshold, args.workers, cache=not args.no_cache)
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 1
+    for path, reason in skipped:
+        print(f"ignoré : {path} : {reason}", file=sys.stderr)
+
+    projects = {p.get("id"): p for p in data.get("projects", [])}
+
+    def label(project, group):
+        if group.startswith("sections["):
+            sections = projects.get(project, {}).get("sections", [])
+            j = int(group[len("sections["):-1])
+            if j < len(sections) and sections[j].get("title"):
+                return f"{group} « {sections[j]['title']} »"
+        return "galerie" if group == "medias" else group
+
+    total = 0
+    for project, groups in report.items():
+        print(project)
+        for (first, second), pairs in groups.items():
+            where = label(project, first) if first == second else f"{label(project, first)} / {label(project, second)}"
+            print(f"  {where} :")
+            for pair in pairs:
+                print(f"    {pair.distance:2d} bit(s)  {pair.first[1]}  ~  {pair.second[1]}")
+            total += len(pairs)
+    print(f"{total} paire(s) presque identique(s) (seuil : {args.threshold} bits sur 64) "
+          f"en {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+def _media_for(args, data) -> dict | None:
+    """Infos des médias pour l'export enrichi (--enrich), sinon None."""
+    if not args.enrich:
+        return None
+    from derivatives import load_manifest
+    from media_info import media_entries
+
+    return media_entries(data, load_manifest(), cache=not args.no_cache)
+
+
+def cmd_save(args) -> int:
+    data = load_projects_file(args.file)
+    save_projects_file(data, args.output or args.file, media=_media_for(args, data))
+    return 0
+
+
+def cmd_shard(args) -> int:
+    store = ShardStore(args.directory)
+    written = store.save(load_projects_file(args.file))
+    print(f"{args.directory}: {len(written)} fichier(s) écrit(s)")
+    return 0
+
+
+def cmd_bundle(args) -> int:
+    store = ShardStore(args.directory)
+    data = store.load()
+    media = _media_for(args, data)
+    if media is None:
+        store.write_bundle(data, args.output)
+    else:
+        save_projects_file(data, args.output, media=media)
+    return 0
+
+
+def cmd_gui(args) -> int:
+    from editor import main as gui_main  # lazy: pulls tkinter/customtkinter
+    gui_main()
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="editor", description="Outils projects-data.js")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("load", help="lit le fichier et affiche un résumé")
+    p.add_argument("file", nargs="?", default=PROJECTS_JSON)
+    p.set_defaults(func=cmd_load)
+
+    p = sub.add_parser("validate", help="vérifie les projets : champs, ids, médias, balisage (code 1 si erreur)")
+    p.add_argument("file", nargs="?", default=PROJECTS_JSON)
+    p.set_defaults(func=cmd_validate)
+
+    p = sub.add_parser("audit", help="références de médias manquantes, casse, fichiers non référencés (code 1 si cassé)")
+    p.add_argument("file", nargs="?", default=PROJECTS_JSON)
+    p.add_argument("--under", default="assets/projects",
+                   help="dossier où chercher les fichiers non référencés (par défaut : assets/projects)")
+    p.add_argument("--workers", type=int, help="threads du parcours (par défaut : 4 par CPU, max 32)")
+    p.add_argument("--no-cache", action="store_true", help="ignore le cache des dossiers dans .cache/")
+    p.add_argument("--strict", action="store_true", help="code 1 aussi s'il reste des fichiers non référencés")
+    p.set_defaults(func=cmd_audit)
+
+    p = sub.add_parser("derive", help="miniatures WebP/AVIF des images référencées + manifest (Pillow requis)")
+    p.add_argument("file", nargs="?", default=PROJECTS_JSON)
+    p.add_argument("--workers", type=int, help="processus de rendu (par défaut : un par CPU)")
+    p.add_argument("--no-cache", action="store_true", help="régénère tous les dérivés")
+    p.add_argument("--keep", action="store_true", help="garde les dérivés qui ne correspondent plus à aucune source")
+    p.set_defaults(func=cmd_derive)
+
+    p = sub.add_parser("dedupe", help="fichiers identiques dans ./assets ; --apply réécrit les références")
+    p.add_argument("file", nargs="?", default=PROJECTS_JSON)
+    p.add_argument("--under", default="assets/projects", help="dossier analysé (par défaut : assets/projects)")
+    p.add_argument("--workers", type=int, help="threads du parcours et du hachage")
+    p.add_argument("--no-cache", action="store_true", help="ignore le cache des dossiers dans .cache/")
+    p.add_argument("--apply", action="store_true",
+                   help="réécrit les références vers le chemin canonique (fichier et shards)")
+    p.add_argument("-d", "--directory", default=SHARDS_DIR, help="dossier des shards, réécrits s'ils existent")
+    action = p.add_mutually_exclusive_group()
+    action.add_argument("--delete", action="store_true", help="avec --apply : supprime les copies")
+    action.add_argument("--hardlink", action="store_true",
+                        help="avec --apply : remplace les copies par des liens physiques")
+    p.set_defaults(func=cmd_dedupe)
+
+    p = sub.add_parser("similar", help="images presque identiques par projet et section (NumPy et Pillow requis)")
+    p.add_argument("file", nargs="?", default=PROJECTS_JSON)
+    p.add_argument("--threshold", type=int, default=8, help="bits de pHash différents tolérés, sur 64 (par défaut : 8)")
+    p.add_argument("--workers", type=int, help="processus de calcul des hashes (par défaut : un par CPU)")
+    p.add_argument("--no-cache", action="store_true", help="recalcule tous les hashes")
+    p.set_defaults(func=cmd_similar)
+
+    p = sub.add_parser("save", help="relit et réécrit le fichier au format de l'éditeur")
+    p.add_argument("file", nargs="?", default=PROJECTS_JSON)
+    p.add_argument("-o", "--output", help="fichier de sortie (par défaut : le fichier lu)")
+    p.add_argument("--enrich", action="store_true",
+                   help="écrit les médias sous forme enrichie : dimensions, poids, variantes de `derive`")
+    p.add_argument("--no-cache", action="store_true", help="avec --enrich : resonde tous les fichiers")
+    p.set_defaults(func=cmd_save)
+
+    p = sub.add_parser("shard", help="éclate le fichier en un shard par projet + manifest")
+    p.add_argument("file", nargs="?", default=PROJECTS_JSON)
+    p.add_argument("-d", "--directory", default=SHARDS_DIR, help="dossier des shards")
+    p.set_defaults(func=cmd_shard)
+
+    p = sub.add_parser("bundle", help="régénère projects-data.js à partir des shards")
+    p.add_argument("-d", "--directory", default=SHARDS_DIR, help="dossier des shards")
+    p.add_argument("-o", "--output", default=PROJECTS_JSON, help="fichier de sortie")
+    p.add_argument("--enrich", action="store_true",
+                   help="écrit les médias sous forme enrichie : dimensions, poids, variantes de `derive`")
+    p.add_argument("--no-cache", action="store_true", help="avec --enrich : resonde tous les fichiers")
+    p.set_defaults(func=cmd_bundle)
+
+    p = sub.add_parser("gui", help="lance l'éditeur graphique")
+    p.set_defaults(func=cmd_gui)
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "dedupe" and (args.delete or args.hardlink) and not args.apply:
+        # Removing the copies before their references are rewritten breaks them
+        parser.error("dedupe : --delete et --hardlink nécessitent --apply")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,578 @@
+"""
+Couche données de l'éditeur, sans dépendance GUI : lecture/écriture de
+projects-data.js, modèle par défaut et validation des chemins d'assets.
+Importable depuis des scripts de build ou des tests sans tkinter.
+"""
+
+import contextlib
+import functools
+import hashlib
+import json
+import marshal
+import os
+import tempfile
+from pathlib import Path
+
+from asset_index import AssetIndex
+from model import json_default, to_plain
+
+# Faster JSON decoder when installed, stdlib otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ------------------------------
+# Config
+# ------------------------------
+ROOT_DIR = Path(__file__).resolve().parent.parent
+PROJECTS_JSON = ROOT_DIR / "assets" / "data" / "projects-data.js"
+LEGACY_PROJECTS_JSON = ROOT_DIR / "projects.json"
+ASSETS_DIR = ROOT_DIR / "assets"
+# Fichiers locaux de l'éditeur (journal, caches), ignorés par git
+CACHE_DIR = ROOT_DIR / ".cache"
+# Champs de projet contenant un chemin vers ./assets
+PATH_FIELDS = ("icon", "media")
+# Index des fichiers de ./assets : la validation des chemins est une lookup
+ASSET_INDEX = AssetIndex(ASSETS_DIR, ROOT_DIR)
+
+# ------------------------------
+# projects-data.js
+# ------------------------------
+
+_JSON_DECODER = json.JSONDecoder()
+_JS_PREFIX = ("window", ".", "PROJECTS_DATA", "=")
+_WS = " \t\r\n"
+_BOM = "\ufeff"
+
+
+def _json_span(text) -> tuple[int, int]:
+    """
+    Bornes [début, fin) de l'objet JSON dans `window.PROJECTS_DATA = {...};`.
+    Seuls le préfixe et la fin du texte sont parcourus : le contenu de l'objet
+    n'est lu qu'une fois, par le décodeur JSON.
+    Accepte str ou bytes. Lève ValueError si le format ne correspond pas.
+    """
+    if isinstance(text, str):
+        ws, bom, tokens, semi, brace = _WS, _BOM, _JS_PREFIX, ";", "{}"
+    else:
+        ws, bom = _WS.encode(), _BOM.encode()
+        tokens = tuple(t.encode() for t in _JS_PREFIX)
+        semi, brace = b";", b"{}"
+    err = ValueError("Le fichier ne contient pas une assignation window.PROJECTS_DATA = {...};")
+
+    i, n = 0, len(text)
+    if text.startswith(bom):
+        i = len(bom)
+    for token in tokens:
+        while i < n and text[i:i + 1] in ws:
+            i += 1
+        if not text.startswith(token, i):
+            raise err
+        i += len(token)
+    while i < n and text[i:i + 1] in ws:
+        i += 1
+
+    j = n
+    while j > i and text[j - 1:j] in ws:
+        j -= 1
+    if text[j - 1:j] == semi:
+        j -= 1
+        while j > i and text[j - 1:j] in ws:
+            j -= 1
+    if j - i < 2 or text[i:i + 1] != brace[:1] or text[j - 1:j] != brace[1:]:
+        raise err
+    return i, j
+
+
+def parse_projects_js(text) -> dict:
+    """
+    Extrait l'objet JSON du fichier JS `window.PROJECTS_DATA = {...};`
+    (str ou bytes) et le retourne sous forme de dict Python.
+    Lève ValueError si le format ne correspond pas.
+    """
+    start, end = _json_span(text)
+    if orjson is not None:
+        # orjson decodes straight from a memoryview, without copying the payload
+        return orjson.loads(memoryview(text)[start:end] if isinstance(text, bytes) else text[start:end])
+    if not isinstance(text, str):
+        text = text.decode("utf-8")
+        start, end = _json_span(text)
+    # raw_decode parses in place from `start`, without slicing a copy
+    obj, stop = _JSON_DECODER.raw_decode(text, start)
+    if stop != end:
+        raise ValueError("Contenu inattendu après l'objet window.PROJECTS_DATA")
+    return obj
+
+def dump_projects_js(data: dict, media: dict | None = None) -> str:
+    """
+    Sérialise le dict Python en JS avec le wrapper window.PROJECTS_DATA = ...;
+    Avec `media` (voir enrich_media), les médias sont écrits sous forme enrichie.
+    """
+    if media is not None:
+        data = enrich_media(data, media)
+    return "window.PROJECTS_DATA = " + json.dumps(data, ensure_ascii=False, indent=2, default=json_default) + ";\n"
+
+
+_JS_ENCODER = json.JSONEncoder(ensure_ascii=False, indent=2, default=json_default)
+# Size of the chunks handed to file.write() by the streaming writer
+_WRITE_CHUNK = 64 * 1024
+
+
+def iter_projects_js(data: dict, media: dict | None = None):
+    """
+    Version incrémentale de dump_projects_js : produit le même texte par
+    morceaux d'environ 64 Kio, sans jamais construire la chaîne complète.
+    """
+    if media is not None:
+        data = enrich_media(data, media)
+    buf, size = ["window.PROJECTS_DATA = "], 0
+    for piece in _JS_ENCODER.iterencode(data):
+        buf.append(piece)
+        size += len(piece)
+        if size >= _WRITE_CHUNK:
+            yield "".join(buf)
+            buf, size = [], 0
+    buf.append(";\n")
+    yield "".join(buf)
+
+
+def _indent(text: str, level: int) -> str:
+    return text.replace("\n", "\n" + "  " * level)
+
+
+def dump_project(project: dict) -> str:
+    """Sérialise un projet seul, au format d'un fragment de projects-data.js."""
+    return json.dumps(project, ensure_ascii=False, indent=2, default=json_default)
+
+
+def iter_assembled_projects_js(data: dict, project_fragments: list[str]):
+    """
+    Produit le fichier JS à partir des fragments déjà sérialisés des projets
+    (voir dump_project), sans réencoder les projets ; data["projects"] n'est
+    pas relu. Les autres clés de `data` sont encodées normalement.
+    """
+    if not data:
+        yield dump_projects_js(data)
+        return
+    yield "window.PROJECTS_DATA = {\n"
+    for n, (key, value) in enumerate(data.items()):
+        sep = ",\n" if n else ""
+        yield f"{sep}  {json.dumps(key, ensure_ascii=False)}: "
+        if key == "projects" and isinstance(value, list):
+            if not project_fragments:
+                yield "[]"
+                continue
+            yield "[\n"
+            for i, fragment in enumerate(project_fragments):
+                yield ("    " if not i else ",\n    ") + _indent(fragment, 2)
+            yield "\n  ]"
+        else:
+            yield _indent(json.dumps(value, ensure_ascii=False, indent=2, default=json_default), 1)
+    yield "\n};\n"
+
+
+def assemble_projects_js(data: dict, project_fragments: list[str]) -> str:
+    """
+    Assemble le fichier JS à partir des fragments des projets.
+    Le résultat est identique octet pour octet à dump_projects_js(data).
+    """
+    return "".join(iter_assembled_projects_js(data, project_fragments))
+
+
+class FragmentCache:
+    """
+    Fragments sérialisés (dump_project) des projets, réutilisés d'une
+    sauvegarde à l'autre. Chaque projet a un compteur de version, incrémenté
+    par touch() à chaque modification : seuls les projets dont la version a
+    changé depuis leur dernier encodage sont réencodés.
+    """
+
+    def __init__(self):
+        # id(project) -> version; entries keep a reference to their project
+        # so that ids are not reused while cached
+        self._versions: dict[int, int] = {}
+        self._entries: dict[int, tuple[dict, int, str]] = {}
+
+    def touch(self, project: dict):
+        self._versions[id(project)] = self._versions.get(id(project), 0) + 1
+
+    def clear(self):
+        self._versions.clear()
+        self._entries.clear()
+
+    def fragments(self, projects: list[dict]) -> list[str]:
+        """Fragments de `projects`, dans l'ordre ; oublie les projets absents."""
+        entries, versions, out = {}, {}, []
+        for proj in projects:
+            key = id(proj)
+            version = self._versions.get(key, 0)
+            entry = self._entries.get(key)
+            if entry is None or entry[0] is not proj or entry[1] != version:
+                entry = (proj, version, dump_project(proj))
+            entries[key] = entry
+            versions[key] = version
+            out.append(entry[2])
+        self._entries, self._versions = entries, versions
+        return out
+
+
+def load_projects_file(path=PROJECTS_JSON, keep_media: bool = False) -> dict:
+    """
+    Lit et parse un fichier projects-data.js. Les médias enrichis sont
+    ramenés à leur chemin, sauf avec `keep_media`.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    data = parse_projects_js(raw)
+    return strip_media_info(data) if not keep_media and _ENRICHED_KEY in raw else data
+
+
+def content_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def file_hash(path) -> str | None:
+    """content_hash du texte d'un fichier, None s'il n'existe pas."""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+@functools.cache
+def _umask() -> int:
+    # Read on the first atomic write, not at import: importing core must not
+    # touch process-wide state. Linux exposes the umask read-only; elsewhere
+    # it can only be read by setting it, then restoring it
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError, IndexError):
+        pass
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def _target_mode(path) -> int:
+    """Droits à donner au fichier remplaçant `path` : ceux de l'existant, sinon 0666 moins l'umask."""
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        return 0o666 & ~_umask()
+
+
+@contextlib.contextmanager
+def _atomic_file(path, binary: bool = False):
+    """
+    Fichier temporaire (texte, ou binaire avec `binary`) du même dossier que
+    `path`, renommé sur `path` après fsync si le bloc se termine normalement.
+    mkstemp crée le fichier en 0600 : les droits du fichier remplacé (ou ceux
+    d'un nouveau fichier selon l'umask) sont appliqués avant le renommage.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", suffix=".part", dir=directory)
+    try:
+        with (os.fdopen(fd, "wb") if binary else os.fdopen(fd, "w", encoding="utf-8", newline="")) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, _target_mode(path))
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    # Persist the rename itself (not supported on Windows)
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+def write_text_atomic(path, text: str):
+    """
+    Écrit `text` dans un fichier temporaire du même dossier, fsync, puis le
+    renomme sur `path` : un crash en cours d'écriture laisse l'ancien fichier
+    intact.
+    """
+    with _atomic_file(path) as f:
+        f.write(text)
+
+
+def save_projects_file(data: dict, path=PROJECTS_JSON, last_hash: str | None = None,
+                       project_fragments: list[str] | None = None, media: dict | None = None) -> str:
+    """
+    Sérialise `data` en streaming et l'écrit (atomiquement) dans un fichier
+    projects-data.js. Avec `project_fragments` (voir FragmentCache), les
+    projets ne sont pas réencodés ; avec `media`, les médias sont écrits sous
+    forme enrichie (les fragments, en forme simple, sont alors ignorés).
+    Retourne le hash du contenu ; si c'est `last_hash`, le fichier existant
+    n'est pas remplacé.
+    """
+    def chunks():
+        if project_fragments is None or media is not None:
+            return iter_projects_js(data, media)
+        return iter_assembled_projects_js(data, project_fragments)
+
+    h = hashlib.blake2b(digest_size=16)
+    if last_hash is not None:
+        # Hash-only pass first: an unchanged file costs no temporary file,
+        # write or fsync. Streaming twice keeps memory bounded; with fragments
+        # the second pass is only a concatenation
+        for chunk in chunks():
+            h.update(chunk.encode("utf-8"))
+        if h.hexdigest() == last_hash:
+            return last_hash
+        h = hashlib.blake2b(digest_size=16)
+    with _atomic_file(path) as f:
+        for chunk in chunks():
+            h.update(chunk.encode("utf-8"))
+            f.write(chunk)
+    return h.hexdigest()
+
+
+def snapshot(data):
+    """Copie profonde des données JSON (dict/list/scalaires), pour les sauvegarder hors du thread UI."""
+    # to_plain rebuilds every dict and list, and turns model nodes into dicts
+    return to_plain(data)
+
+
+# ------------------------------
+# Parse cache (.cache/)
+# ------------------------------
+
+# Bump when the cached structure changes
+_PARSE_CACHE_VERSION = 3
+
+
+def _parse_cache_path(path, cache_dir) -> Path:
+    source = Path(path).resolve()
+    tag = hashlib.blake2b(str(source).encode("utf-8"), digest_size=4).hexdigest()
+    return Path(cache_dir) / f"{source.name}.{tag}.marshal"
+
+
+def load_projects_cached(path=PROJECTS_JSON, cache_dir=CACHE_DIR) -> tuple[dict, str]:
+    """
+    Comme load_projects_file, avec un cache binaire (marshal) des données
+    parsées dans `cache_dir`, clé = (taille, mtime, hash du contenu).
+    Si la taille et le mtime du fichier n'ont pas changé, il n'est même pas
+    relu ; sinon le cache sert encore si le contenu a le même hash (fichier
+    simplement touché). Dans les autres cas le fichier est parsé et le cache
+    réécrit.
+    Retourne (données, file_hash du fichier), le hash venant du cache s'il
+    sert.
+    """
+    st = os.stat(path)
+    cache_path = _parse_cache_path(path, cache_dir)
+    # Layout: header length (4 bytes), marshalled key, marshalled data.
+    # marshal.load() on a file object reads item by item; loads() on one
+    # buffer is several times faster.
+    cached_key, blob = None, None
+    try:
+        with open(cache_path, "rb") as f:
+            blob = memoryview(f.read())
+        n = int.from_bytes(blob[:4], "little")
+        cached_key, blob = marshal.loads(blob[4:4 + n]), blob[4 + n:]
+        if cached_key[:3] == (_PARSE_CACHE_VERSION, st.st_size, st.st_mtime_ns):
+            return marshal.loads(blob), cached_key[3]
+    except (OSError, EOFError, ValueError, TypeError, IndexError):
+        cached_key = None
+
+    with open(path, "rb") as f:
+        raw = f.read()
+    # Same hash as file_hash(): the editor uses it as the journal base
+    digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+    if cached_key is not None and cached_key[0] == _PARSE_CACHE_VERSION and cached_key[3] == digest:
+        try:
+            return marshal.loads(blob), digest
+        except (EOFError, ValueError, TypeError):
+            pass
+
+    data = parse_projects_js(raw)
+    if _ENRICHED_KEY in raw:
+        data = strip_media_info(data)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        header = marshal.dumps((_PARSE_CACHE_VERSION, st.st_size, st.st_mtime_ns, digest))
+        with _atomic_file(cache_path, binary=True) as f:
+            f.write(len(header).to_bytes(4, "little"))
+            f.write(header)
+            f.write(marshal.dumps(data))
+    except (OSError, ValueError):
+        pass  # the cache is optional: a read-only checkout still loads
+    return data, digest
+
+
+# ------------------------------
+# Tool caches (.cache/)
+# ------------------------------
+
+def load_cache(path, version: int, default=None):
+    """
+    Valeur d'un cache marshal écrit par save_cache, ou `default` si le
+    fichier manque, est illisible ou date d'une autre `version`.
+    """
+    try:
+        with open(path, "rb") as f:
+            cached_version, value = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return default
+    return value if cached_version == version else default
+
+
+def save_cache(path, version: int, value):
+    """Écrit (atomiquement) un cache marshal ; un échec est ignoré, le cache étant optionnel."""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with _atomic_file(path, binary=True) as f:
+            f.write(marshal.dumps((version, value)))
+    except (OSError, ValueError):
+        pass
+
+
+# ------------------------------
+# Assets paths
+# ------------------------------
+
+def ensure_assets_dir():
+    ASSETS_DIR.mkdir(parents=True, exist_ok=True)
+
+
+def normalize_asset_path(path_str: str) -> str:
+    """
+    Retourne le chemin relatif POSIX d'un fichier de ./assets.
+    Lève ValueError si le chemin n'est pas un fichier de ./assets.
+    """
+    path_str = path_str.strip()
+    if not path_str:
+        return path_str
+    rel = ASSET_INDEX.lookup(path_str)
+    if rel is None:
+        raise ValueError(f"Le chemin doit être dans ./assets : {path_str}")
+    return rel
+
+
+def iter_media_paths(project: dict):
+    """
+    Parcourt les chemins de médias d'un projet.
+    Produit des couples (emplacement, chemin), par ex. ("sections[2].medias[0]", "assets/...").
+    """
+    for field in PATH_FIELDS:
+        if project.get(field):
+            yield field, media_src(project[field])
+    for i, path in enumerate(project.get("medias", [])):
+        yield f"medias[{i}]", media_src(path)
+    for j, sec in enumerate(project.get("sections", [])):
+        for i, path in enumerate(sec.get("medias", [])):
+            yield f"sections[{j}].medias[{i}]", media_src(path)
+
+
+# ------------------------------
+# Media entries
+# ------------------------------
+# A media is a path string, or in the enriched export form an object
+# {"src": path, "width", "height", "bytes", "variants": [...], "placeholder"}.
+
+# Inside a JSON string the quotes would be escaped: this only matches a key,
+# so a plain file skips strip_media_info() entirely
+_ENRICHED_KEY = b'"src":'
+
+def media_src(entry):
+    """Chemin d'une entrée de média, simple ou enrichie."""
+    return entry.get("src", "") if isinstance(entry, dict) else entry
+
+
+def map_medias(project, func):
+    """Copie superficielle de `project` avec func() appliquée à chaque entrée de média."""
+    project = dict(project)
+    for field in PATH_FIELDS:
+        if field in project:
+            project[field] = func(project[field])
+    if isinstance(project.get("medias"), list):
+        project["medias"] = [func(m) for m in project["medias"]]
+    if isinstance(project.get("sections"), list):
+        project["sections"] = [
+            {**sec, "medias": [func(m) for m in sec["medias"]]}
+            if isinstance(sec, dict) and isinstance(sec.get("medias"), list) else sec
+            for sec in project["sections"]
+        ]
+    return project
+
+
+def enrich_media(data: dict, media: dict[str, dict]) -> dict:
+    """
+    Copie de `data` où chaque chemin présent dans `media` (chemin normalisé →
+    {"width", "height", "bytes", "variants"}, voir media_info.media_entries)
+    devient un objet {"src": chemin, ...}. Les autres restent des chaînes.
+    `data` n'est pas modifié.
+    """
+    def enrich(entry):
+        if not isinstance(entry, str) or not entry:
+            return entry
+        info = media.get(ASSET_INDEX.normalize(entry))
+        return {"src": entry, **info} if info else entry
+
+    return {**data, "projects": [map_medias(p, enrich) for p in data.get("projects", [])]}
+
+
+def _has_media_objects(project) -> bool:
+    if any(isinstance(project.get(f), dict) for f in PATH_FIELDS):
+        return True
+    if any(isinstance(m, dict) for m in project.get("medias") or ()):
+        return True
+    return any(
+        isinstance(m, dict)
+        for sec in project.get("sections") or () if isinstance(sec, dict)
+        for m in sec.get("medias") or ()
+    )
+
+
+def strip_media_info(data: dict) -> dict:
+    """
+    Ramène (sur place) les médias enrichis à leur chemin : l'éditeur ne
+    manipule que la forme simple. Retourne `data`.
+    """
+    projects = data.get("projects")
+    if isinstance(projects, list):
+        for i, proj in enumerate(projects):
+            if isinstance(proj, dict) and _has_media_objects(proj):
+                projects[i] = map_medias(proj, media_src)
+    return data
+
+
+# ------------------------------
+# Data Model
+# ------------------------------
+
+def default_project() -> dict:
+    return {
+        "id": "nouveau-projet",
+        "title": "Nouveau Projet",
+        "category": "autre",
+        "icon": "./assets/images/placeholder.png",
+        "description": "",
+        "media": "./assets/images/placeholder.png",
+        "sections": [],
+        "medias": [],
+    }
+
+
+def default_section() -> dict:
+    return {
+        "title": "Nouvelle section",
+        "description": "",
+        "medias": [],
+    }
@@ -6,6 +6,23 @@ Author: Akash Bora
 import customtkinter
 import ast
 
+
+def _resolve_font(font):
+    if isinstance(font, customtkinter.CTkFont):
+        return font
+    if font and isinstance(font, tuple):
+        return customtkinter.CTkFont(*font)
+    return customtkinter.CTkFont(customtkinter.ThemeManager.theme["CTkFont"]["family"],13)
+
+
+def _resolve_justify(justify):
+    if justify == "left":
+        return "w"
+    if justify == "right":
+        return "e"
+    return "c"
+
+
 class CTkListbox(customtkinter.CTkScrollableFrame):
     def __init__(
         self,
@@ -31,6 +48,10 @@ class CTkListbox(customtkinter.CTkScrollableFrame):
 
         self.buttons = {}
         self.bindings = {}
+        # Ordered keys of `buttons` and a key -> position map, so that
+        # positional lookups do not rebuild lists of the whole dict.
+        self._keys = []
+        self._pos = {}
 
         super().__init__(
             master,
@@ -62,34 +83,21 @@ class CTkListbox(customtkinter.CTkScrollableFrame):
             else hover_color
         )
         
-        if not font:
-            self.font = customtkinter.CTkFont(customtkinter.ThemeManager.theme["CTkFont"]["family"],13)
-        else:
-            if isinstance(font, customtkinter.CTkFont):
-                self.font = font
-            else:
-                if isinstance(font, tuple):
-                    self.font = customtkinter.CTkFont(*font)
-                else:
-                    self.font = customtkinter.CTkFont(customtkinter.ThemeManager.theme["CTkFont"]["family"],13)
-                    
+        self.font = _resolve_font(font)
+
         self.button_fg_color = (
             "transparent" if button_color == "default" else button_color
         )
 
-        if justify == "left":
-            self.justify = "w"
-        elif justify == "right":
-            self.justify = "e"
-        else:
-            self.justify = "c"
+        self.justify = _resolve_justify(justify)
 
         self.command = command
         self.multiple = multiple_selection
         self.selected = None
+        self._selected_key = None
         self.hover = hover
         self.end_num = 0
-        self.selections = []
+        self.selections = {}  # selected button -> key, in selection order
         self.selected_index = 0
         self.wraplength = wraplength
         self._scrollbar.configure(height=height)
@@ -102,49 +110,58 @@ class CTkListbox(customtkinter.CTkScrollableFrame):
 
     def update_listvar(self):
         values = list(ast.literal_eval(self.listvariable.get()))
-        self.delete("all")
-        for i in values:
-            self.insert("END", option=i)
+        self.replace_all(values)
 
     def select_set(self, index):
         """select the option"""
         self.select(index)
 
+    def _key(self, index):
+        """resolve a key or a position to a key"""
+        if index in self.buttons:
+            return index
+        if str(index).lower() == "end":
+            index = -1
+        return self._keys[int(index)]
+
+    def _reindex(self, start=0):
+        for i in range(start, len(self._keys)):
+            self._pos[self._keys[i]] = i
+
+    def _paint(self, button, selected):
+        if selected:
+            button.configure(fg_color=self.select_color, hover=False)
+            self.after(100, lambda: button.configure(hover=self.hover))
+        else:
+            button.configure(fg_color=self.button_fg_color)
+
     def select(self, index):
         """select the option"""
         if str(index).lower() == "all":
             if self.multiple:
-                for button in self.buttons.values():
-                    button.configure(fg_color=self.select_color, hover=False)
+                for key, button in self.buttons.items():
                     if button not in self.selections:
-                        self.selections.append(button)
+                        self.selections[button] = key
+                        button.configure(fg_color=self.select_color, hover=False)
             return
-        
-        for options in self.buttons.values():
-            options.configure(fg_color=self.button_fg_color)
-        
-        if isinstance(index, int):
-            if index in self.buttons:
-                selected_button = self.buttons[index]
-            else:
-                selected_button = list(self.buttons.values())[index]
-        else:
-            selected_button = self.buttons[index]
-  
+
+        key = self._key(index)
+        selected_button = self.buttons[key]
+
         if self.multiple:
             if selected_button in self.selections:
-                self.selections.remove(selected_button)
+                del self.selections[selected_button]
                 selected_button.configure(fg_color=self.button_fg_color, hover=False)
                 self.after(100, lambda: selected_button.configure(hover=self.hover))
             else:
-                self.selections.append(selected_button)
-            for i in self.selections:
-                i.configure(fg_color=self.select_color, hover=False)
-                self.after(100, lambda button=i: button.configure(hover=self.hover))
+                self.selections[selected_button] = key
+                self._paint(selected_button, True)
         else:
+            if self.selected is not None and self.selected is not selected_button:
+                self._paint(self.selected, False)
             self.selected = selected_button
-            selected_button.configure(fg_color=self.select_color, hover=False)
-            self.after(100, lambda: selected_button.configure(hover=self.hover))
+            self._selected_key = key
+            self._paint(selected_button, True)
 
         if self.command:
             self.command(self.get())
@@ -154,32 +171,19 @@ class CTkListbox(customtkinter.CTkScrollableFrame):
     def activate(self, index):
         if str(index).lower() == "all":
             if self.multiple:
-                for i in self.buttons:
+                for i in list(self._keys):
                     self.select(i)
             return
 
         if str(index).lower() == "end":
             index = -1
 
-        selected = list(self.buttons.keys())[index]
-        self.select(selected)
+        self.select(self._keys[index])
 
     def curselection(self):
-        index = 0
         if self.multiple:
-            indexes = []
-            for i in self.buttons.values():
-                if i in self.selections:
-                    indexes.append(index)
-                index += 1
-            return tuple(indexes)
-
-        else:
-            for i in self.buttons.values():
-                if i == self.selected:
-                    return index
-                else:
-                    index += 1
+            return tuple(sorted(self._pos[key] for key in self.selections.values()))
+        return self._pos.get(self._selected_key)
 
     def bind(self, key, func, add="+"):
         super().bind(key, lambda e: func(e), add=add)
@@ -208,25 +212,26 @@ class CTkListbox(customtkinter.CTkScrollableFrame):
             if self.selected:
                 self.selected.configure(fg_color=self.button_fg_color)
                 self.selected = None
+                self._selected_key = None
                 return
         if index in self.buttons and self.buttons[index] in self.selections:
-            self.selections.remove(self.buttons[index])
+            del self.selections[self.buttons[index]]
             self.buttons[index].configure(fg_color=self.button_fg_color)
 
     def deactivate(self, index):
         if str(index).lower() == "all":
             if self.multiple:
-                for i in self.buttons:
-                    self.deselect(i)
+                for button in list(self.selections):
+                    button.configure(fg_color=self.button_fg_color)
+                self.selections.clear()
             elif len(self.buttons):
                 self.deselect(0)
             return
-        
+
         if str(index).lower() == "end":
             index = -1
 
-        selected = list(self.buttons.keys())[index]
-        self.deselect(selected)
+        self.deselect(self._keys[index])
 
     def insert(self, index, option, update=True, **args):
         """add new option in the listbox"""
@@ -236,7 +241,11 @@ class CTkListbox(customtkinter.CTkScrollableFrame):
             self.end_num += 1
 
         if index in self.buttons:
+            self._forget_selection(index)
             self.buttons[index].destroy()
+        else:
+            self._pos[index] = len(self._keys)
+            self._keys.append(index)
 
         self.buttons[index] = customtkinter.CTkButton(
             self,
@@ -263,7 +272,7 @@ class CTkListbox(customtkinter.CTkScrollableFrame):
 
         if self.multiple:
             self.buttons[index].bind(
-                "<Shift-1>", lambda e: self.select_multiple(self.buttons[index])
+                "<Shift-1>", lambda e: self._select_range(index)
             )
 
         # Apply stored bindings to the new button
@@ -273,20 +282,74 @@ class CTkListbox(customtkinter.CTkScrollableFrame):
 
         return self.buttons[index]
         
+    def insert_many(self, index, options, **args):
+        """add several options at a position, with a single layout pass"""
+        if str(index).lower() == "end":
+            pos = len(self._keys)
+        else:
+            pos = max(0, min(int(index), len(self._keys)))
+        count = len(self._keys)
+        for option in options:
+            self.insert("END", option, update=False, **args)
+        added = len(self._keys) - count
+        if added and pos < count:
+            # The new buttons were appended: move their keys to `pos`, then
+            # regrid them and the following options after the previous row
+            new_keys = self._keys[count:]
+            del self._keys[count:]
+            self._keys[pos:pos] = new_keys
+            self._reindex(pos)
+            row = int(self.buttons[self._keys[pos - 1]].grid_info()["row"]) + 1 if pos else 0
+            for key in self._keys[pos:]:
+                self.buttons[key].grid_configure(row=row)
+                row += 1
+        self.update_idletasks()
+
+    def replace_all(self, options):
+        """replace every option, reusing the existing buttons where possible"""
+        options = list(options)
+        self.deactivate("all")
+        keys = self._keys
+        for key, option in zip(keys, options):
+            self.buttons[key].configure(text=option)
+        for key in keys[len(options):]:
+            self.buttons.pop(key).destroy()
+            del self._pos[key]
+        del keys[len(options):]
+        for option in options[len(keys):]:
+            self.insert("END", option, update=False)
+        self.update_idletasks()
+
+    def relabel(self, index, option):
+        """change the text of an option in place"""
+        self.buttons[self._key(index)].configure(text=option)
+
     def select_multiple(self, button):
-        selections = list(self.buttons.values())
+        for key, item in self.buttons.items():
+            if item is button:
+                self._select_range(key)
+                return
+
+    def _select_range(self, key):
         if len(self.selections) > 0:
-            last = selections.index(self.selections[-1])
-            to = selections.index(button)
+            last = self._pos[next(reversed(self.selections.values()))]
+            to = self._pos[key]
 
             if last < to:
-                for i in range(last + 1, to + 1):
-                    if list(self.buttons.values())[i] not in self.selections:
-                        self.select(i)
+                span = range(last + 1, to + 1)
             else:
-                for i in range(to, last):
-                    if list(self.buttons.values())[i] not in self.selections:
-                        self.select(i)
+                span = range(to, last)
+            for i in span:
+                if self.buttons[self._keys[i]] not in self.selections:
+                    self.select(self._keys[i])
+
+    def _forget_selection(self, key):
+        button = self.buttons[key]
+        self.selections.pop(button, None)
+        if button is self.selected:
+            self.selected = None
+            self._selected_key = None
+
     def destroy(self):
         for i in self.buttons:
             self.buttons[i].destroy()
@@ -302,55 +365,50 @@ class CTkListbox(customtkinter.CTkScrollableFrame):
             self.deactivate("all")
             for i in self.buttons:
                 self.buttons[i].destroy()
-                self.update()
             self.buttons = {}
+            self._keys = []
+            self._pos = {}
+            self.selections = {}
             self.end_num = 0
+            self.update_idletasks()
             return
 
         if str(index).lower() == "end":
             self.end_num -= 1
-            if len(self.buttons.keys())>0:
-                index = list(self.buttons.keys())[-1]
-            if index not in self.buttons:
+            if not self._keys:
                 return
+            start = stop = len(self._keys) - 1
         else:
-            if int(index) >= len(self.buttons):
+            start = int(index)
+            if start >= len(self._keys):
                 return
-            if not last:
-                index = list(self.buttons.keys())[int(index)]
+            stop = start
 
         if last:
-            if str(last).lower() == "end":
-                last = len(self.buttons) - 1
-            elif int(last) >= len(self.buttons):
-                last = len(self.buttons) - 1
-
-            deleted_list = []
-            for i in range(int(index), int(last) + 1):
-                list(self.buttons.values())[i].destroy()
-                deleted_list.append(list(self.buttons.keys())[i])
-                self.update()
-            for i in deleted_list:
-                del self.buttons[i]
-        else:
-            self.buttons[index].destroy()
-            if self.multiple:
-                if self.buttons[index] in self.selections:
-                    self.selections.remove(self.buttons[index])
-            del self.buttons[index]
-        
+            if str(last).lower() == "end" or int(last) >= len(self._keys):
+                stop = len(self._keys) - 1
+            else:
+                stop = int(last)
+
+        for key in self._keys[start:stop + 1]:
+            self._forget_selection(key)
+            self.buttons.pop(key).destroy()
+            del self._pos[key]
+        del self._keys[start:stop + 1]
+        self._reindex(start)
+
     def size(self):
         """return total number of items in the listbox"""
-        return len(self.buttons.keys())
+        return len(self._keys)
 
     def see(self, index):
         """Move the frame to the specific button position, placing it at the top."""
         if index in self.buttons:
             button = self.buttons[index]
-        elif isinstance(index, int) and 0 <= index < len(self.buttons):
-            button = list(self.buttons.values())[index]
+        elif isinstance(index, int) and 0 <= index < len(self._keys):
+            button = self.buttons[self._keys[index]]
         else:
-            if isinstance(index, int) and index >= len(self.buttons):
+            if isinstance(index, int) and index >= len(self._keys):
                 self._scrollbar._command("moveto", 1.0)
                 return
             return  # Invalid index
@@ -363,15 +421,14 @@ class CTkListbox(customtkinter.CTkScrollableFrame):
             return
 
         self._parent_canvas.yview_moveto(button_y / scroll_height)
-            
+
     def get(self, index=None):
         """get the selected value"""
         if index is not None:
             if str(index).lower() == "all":
-                return list(item.cget("text") for item in self.buttons.values())
+                return list(self.buttons[key].cget("text") for key in self._keys)
             else:
-                index = list(self.buttons.keys())[int(index)]
-                return self.buttons[index].cget("text")
+                return self.buttons[self._keys[int(index)]].cget("text")
         else:
             if self.multiple:
                 return (
@@ -415,13 +472,7 @@ class CTkListbox(customtkinter.CTkScrollableFrame):
             for i in self.buttons.values():
                 i.configure(hover=self.hover)
         if "justify" in kwargs:
-            self.justify = kwargs.pop("justify")
-            if self.justify == "left":
-                self.justify = "w"
-            elif self.justify == "right":
-                self.justify = "e"
-            else:
-                self.justify = "c"
+            self.justify = _resolve_justify(kwargs.pop("justify"))
             for i in self.buttons.values():
                 i.configure(anchor=self.justify) 
         if "height" in kwargs:
@@ -451,8 +502,8 @@ class CTkListbox(customtkinter.CTkScrollableFrame):
     def move_up(self, index):
         """Move the option up in the listbox"""
         if index > 0:
-            current_key = list(self.buttons.keys())[index]
-            previous_key = list(self.buttons.keys())[index - 1]
+            current_key = self._keys[index]
+            previous_key = self._keys[index - 1]
 
             # Store the text of the button to be moved
             current_text = self.buttons[current_key].cget("text")
@@ -475,9 +526,9 @@ class CTkListbox(customtkinter.CTkScrollableFrame):
 
     def move_down(self, index):
         """Move the option down in the listbox"""
-        if index < len(self.buttons) - 1:
-            current_key = list(self.buttons.keys())[index]
-            next_key = list(self.buttons.keys())[index + 1]
+        if index < len(self._keys) - 1:
+            current_key = self._keys[index]
+            next_key = self._keys[index + 1]
 
             # Store the text of the button to be moved
             current_text = self.buttons[current_key].cget("text")
@@ -497,3 +548,514 @@ class CTkListbox(customtkinter.CTkScrollableFrame):
             # Update the scrollbar position
             if self._parent_canvas.yview() != (0.0, 1.0):
                 self._parent_canvas.yview("scroll", int(100 / 6), "units")
+
+
+class CTkVirtualListbox(customtkinter.CTkFrame):
+    """
+    Listbox with the CTkListbox API that only materializes the visible rows.
+    A fixed pool of buttons sized to the viewport is rebound to the item data
+    while scrolling, so the widget cost stays flat whatever the item count.
+
+    Differences with CTkListbox: there is no button per option, so insert()
+    returns the option's position instead of its button, and the button
+    options passed to insert()/insert_many() are ignored.
+    """
+
+    def __init__(
+        self,
+        master: any,
+        height: int = 100,
+        width: int = 150,
+        highlight_color: str = "default",
+        fg_color: str = "transparent",
+        bg_color: str = None,
+        text_color: str = "default",
+        hover_color: str = "default",
+        button_color: str = "default",
+        border_width: int = 3,
+        font: tuple = None,
+        multiple_selection: bool = False,
+        listvariable=None,
+        hover: bool = True,
+        command=None,
+        justify="left",
+        row_height: int = 28,
+        **kwargs,
+        ):
+
+        self.bindings = {}
+
+        super().__init__(
+            master,
+            width=width,
+            height=height,
+            fg_color=fg_color,
+            border_width=border_width,
+            **kwargs,
+        )
+
+        if bg_color:
+            super().configure(bg_color=bg_color)
+
+        self.select_color = (
+            customtkinter.ThemeManager.theme["CTkButton"]["fg_color"]
+            if highlight_color == "default"
+            else highlight_color
+        )
+        self.text_color = (
+            customtkinter.ThemeManager.theme["CTkLabel"]["text_color"]
+            if text_color == "default"
+            else text_color
+        )
+        self.hover_color = (
+            customtkinter.ThemeManager.theme["CTkButton"]["hover_color"]
+            if hover_color == "default"
+            else hover_color
+        )
+        self.font = _resolve_font(font)
+        self.button_fg_color = (
+            "transparent" if button_color == "default" else button_color
+        )
+        self.justify = _resolve_justify(justify)
+
+        self.command = command
+        self.multiple = multiple_selection
+        self.hover = hover
+        self.row_height = row_height
+
+        # Item data: ordered keys, their texts and a key -> position map.
+        # Keys are stable across inserts/deletes so selections follow items.
+        self._keys = []
+        self._texts = []
+        self._pos = {}
+        self._next_key = 0
+        self._selected = None
+        self._selections = {}  # ordered set of keys (multiple selection)
+
+        # Row pool: one button per visible slot, `_row_state` caches what each
+        # slot currently shows so a redraw only touches the rows that changed.
+        self._pool = []
+        self._row_state = []
+        self._first = 0
+        self._redraw_id = None
+
+        self.grid_propagate(False)
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        self._rows_frame = customtkinter.CTkFrame(self, fg_color="transparent", height=height)
+        self._rows_frame.grid(row=0, column=0, sticky="nsew", padx=(border_width + 3, 4), pady=border_width + 3)
+        self._rows_frame.grid_propagate(False)
+        self._rows_frame.columnconfigure(0, weight=1)
+
+        self._scrollbar = customtkinter.CTkScrollbar(self, width=12, command=self._yview)
+        self._scrollbar.grid(row=0, column=1, sticky="ns", padx=(0, border_width + 4), pady=border_width + 3)
+
+        self._rows_frame.bind("<Configure>", self._on_resize)
+        self._bind_wheel(self._rows_frame)
+
+        if listvariable:
+            self.listvariable = listvariable
+            self.listvariable.trace_add("write", lambda a, b, c: self.update_listvar())
+            self.update_listvar()
+
+    # ---- Row pool ----
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_mousewheel, add="+")
+        widget.bind("<Button-4>", self._on_mousewheel, add="+")
+        widget.bind("<Button-5>", self._on_mousewheel, add="+")
+
+    def _make_row(self, slot):
+        button = customtkinter.CTkButton(
+            self._rows_frame,
+            text="",
+            height=self.row_height,
+            fg_color=self.button_fg_color,
+            anchor=self.justify,
+            text_color=self.text_color,
+            font=self.font,
+            hover_color=self.hover_color,
+            command=lambda s=slot: self._on_row_click(s),
+        )
+        button._text_label.config(anchor="w")
+        button.grid(padx=0, pady=(0, 5), sticky="ew", column=0, row=slot)
+        button.grid_remove()
+        button.bind("<Shift-1>", lambda e, s=slot: self._on_row_shift_click(s))
+        self._bind_wheel(button)
+        for key, funcs in self.bindings.items():
+            for func, add in funcs:
+                button.bind(key, lambda e, f=func: f(e), add=add)
+        return button
+
+    def _on_resize(self, event):
+        # event.height is in real pixels: customtkinter scales the button
+        # height on HiDPI, the grid padding (5) is not scaled
+        pitch = self._apply_widget_scaling(self.row_height) + 5
+        count = max(1, int(event.height // pitch))
+        while len(self._pool) < count:
+            self._pool.append(self._make_row(len(self._pool)))
+            self._row_state.append(None)
+        while len(self._pool) > count:
+            self._pool.pop().destroy()
+            self._row_state.pop()
+        self._scroll_to(self._first, force=True)
+
+    def _schedule_redraw(self):
+        if self._redraw_id is None:
+            self._redraw_id = self.after_idle(self._redraw)
+
+    def _redraw(self):
+        self._redraw_id = None
+        n = len(self._keys)
+        for slot, button in enumerate(self._pool):
+            pos = self._first + slot
+            if pos >= n:
+                if self._row_state[slot] is not None:
+                    button.grid_remove()
+                    self._row_state[slot] = None
+                continue
+            key = self._keys[pos]
+            selected = key == self._selected or key in self._selections
+            state = (self._texts[pos], selected)
+            if self._row_state[slot] == state:
+                continue
+            button.configure(
+                text=state[0],
+                fg_color=self.select_color if selected else self.button_fg_color,
+                hover=self.hover and not selected,
+            )
+            if self._row_state[slot] is None:
+                button.grid()
+            self._row_state[slot] = state
+        if n:
+            self._scrollbar.set(self._first / n, min(1.0, (self._first + len(self._pool)) / n))
+        else:
+            self._scrollbar.set(0.0, 1.0)
+
+    def _repaint_all(self):
+        # False (not None) keeps shown rows gridded but forces a reconfigure.
+        self._row_state = [None if state is None else False for state in self._row_state]
+        self._schedule_redraw()
+
+    def _scroll_to(self, first, force=False):
+        first = max(0, min(int(first), len(self._keys) - len(self._pool)))
+        if first != self._first or force:
+            self._first = first
+            self._schedule_redraw()
+
+    def _yview(self, *args):
+        if args[0] == "moveto":
+            self._scroll_to(round(float(args[1]) * len(self._keys)))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if len(args) > 2 and args[2] == "pages":
+                step *= len(self._pool)
+            self._scroll_to(self._first + step)
+
+    def _on_mousewheel(self, event):
+        if event.num == 4:
+            step = -1
+        elif event.num == 5:
+            step = 1
+        else:
+            step = -1 if event.delta > 0 else 1
+        self._scroll_to(self._first + step * 3)
+
+    def _on_row_click(self, slot):
+        pos = self._first + slot
+        if pos < len(self._keys):
+            self.select(pos)
+
+    def _on_row_shift_click(self, slot):
+        if not self.multiple or not self._selections:
+            return
+        to = self._first + slot
+        last = self._pos[next(reversed(self._selections))]
+        # The click itself toggles `to` through the button command.
+        span = range(last + 1, to) if last < to else range(to + 1, last)
+        for pos in span:
+            if self._keys[pos] not in self._selections:
+                self.select(pos)
+
+    # ---- Item bookkeeping ----
+    def _index(self, index):
+        n = len(self._keys)
+        if str(index).lower() == "end":
+            index = n - 1
+        try:
+            index = int(index)
+        except (TypeError, ValueError):
+            return None
+        if index < 0:
+            index += n
+        return index if 0 <= index < n else None
+
+    def _reindex(self, start=0):
+        for i in range(start, len(self._keys)):
+            self._pos[self._keys[i]] = i
+
+    # ---- Public API (same as CTkListbox) ----
+    def update_listvar(self):
+        values = list(ast.literal_eval(self.listvariable.get()))
+        self.replace_all(values)
+
+    def select_set(self, index):
+        """select the option"""
+        self.select(index)
+
+    def select(self, index):
+        """select the option"""
+        if str(index).lower() == "all":
+            if self.multiple:
+                for key in self._keys:
+                    self._selections[key] = None
+                self._schedule_redraw()
+            return
+
+        pos = self._index(index)
+        if pos is None:
+            return
+        key = self._keys[pos]
+        if self.multiple:
+            if key in self._selections:
+                del self._selections[key]
+            else:
+                self._selections[key] = None
+        else:
+            self._selected = key
+        self._schedule_redraw()
+
+        if self.command:
+            self.command(self.get())
+
+        self.event_generate("<<ListboxSelect>>")
+
+    def activate(self, index):
+        if str(index).lower() == "all":
+            if self.multiple:
+                for i in range(len(self._keys)):
+                    self.select(i)
+            return
+        self.select(index)
+
+    def curselection(self):
+        if self.multiple:
+            return tuple(sorted(self._pos[key] for key in self._selections))
+        return self._pos.get(self._selected)
+
+    def bind(self, key, func, add="+"):
+        super().bind(key, lambda e: func(e), add=add)
+        self._rows_frame.bind(key, lambda e: func(e), add=add)
+        for button in self._pool:
+            button.bind(key, lambda e: func(e), add=add)
+
+        if key not in self.bindings:
+            self.bindings[key] = []
+        self.bindings[key].append((func, add))
+
+    def unbind(self, key):
+        super().unbind(key)
+        self._rows_frame.unbind(key)
+        for button in self._pool:
+            button.unbind(key)
+
+        if key in self.bindings:
+            del self.bindings[key]
+
+    def deselect(self, index):
+        if not self.multiple:
+            self._selected = None
+        else:
+            pos = self._index(index)
+            if pos is not None:
+                self._selections.pop(self._keys[pos], None)
+        self._schedule_redraw()
+
+    def deactivate(self, index):
+        if str(index).lower() == "all":
+            self._selected = None
+            self._selections.clear()
+            self._schedule_redraw()
+            return
+        self.deselect(index)
+
+    def insert(self, index, option, update=True, **args):
+        """
+        add new option in the listbox and return its position
+        (`update` and the button options in `args` are accepted for API
+        compatibility and ignored: the pooled rows share one style)
+        """
+        if str(index).lower() == "end":
+            pos = len(self._keys)
+        else:
+            pos = max(0, min(int(index), len(self._keys)))
+        key = self._next_key
+        self._next_key += 1
+        self._keys.insert(pos, key)
+        self._texts.insert(pos, str(option))
+        self._reindex(pos)
+        self._schedule_redraw()
+        return pos
+
+    def insert_many(self, index, options, **args):
+        """add several options with a single redraw (`args` are ignored, see insert)"""
+        options = [str(option) for option in options]
+        if str(index).lower() == "end":
+            pos = len(self._keys)
+        else:
+            pos = max(0, min(int(index), len(self._keys)))
+        keys = list(range(self._next_key, self._next_key + len(options)))
+        self._next_key += len(options)
+        self._keys[pos:pos] = keys
+        self._texts[pos:pos] = options
+        self._reindex(pos)
+        self._schedule_redraw()
+
+    def replace_all(self, options):
+        """replace every option with a single redraw"""
+        self.delete("all")
+        self.insert_many("end", options)
+
+    def relabel(self, index, option):
+        """change the text of an option in place"""
+        pos = self._index(index)
+        if pos is not None:
+            self._texts[pos] = str(option)
+            self._schedule_redraw()
+
+    def delete(self, index, last=None):
+        """delete options from the listbox"""
+        if str(index).lower() == "all":
+            self._keys.clear()
+            self._texts.clear()
+            self._pos.clear()
+            self._selected = None
+            self._selections.clear()
+            self._first = 0
+            self._schedule_redraw()
+            return
+
+        start = self._index(index)
+        if start is None:
+            return
+        if last is None:
+            stop = start
+        elif str(last).lower() == "end":
+            stop = len(self._keys) - 1
+        else:
+            stop = min(int(last), len(self._keys) - 1)
+
+        for key in self._keys[start:stop + 1]:
+            del self._pos[key]
+            self._selections.pop(key, None)
+            if key == self._selected:
+                self._selected = None
+        del self._keys[start:stop + 1]
+        del self._texts[start:stop + 1]
+        self._reindex(start)
+        self._scroll_to(self._first, force=True)
+
+    def size(self):
+        """return total number of items in the listbox"""
+        return len(self._keys)
+
+    def see(self, index):
+        """Scroll so that the option is visible, placing it at the top."""
+        pos = self._index(index)
+        if pos is None:
+            if isinstance(index, int) and index >= len(self._keys):
+                self._scroll_to(len(self._keys))
+            return
+        if not (self._first <= pos < self._first + len(self._pool)):
+            self._scroll_to(pos)
+
+    def get(self, index=None):
+        """get the selected value"""
+        if index is not None:
+            if str(index).lower() == "all":
+                return list(self._texts)
+            pos = self._index(index)
+            return self._texts[pos] if pos is not None else None
+        if self.multiple:
+            return (
+                [self._texts[self._pos[key]] for key in self._selections]
+                if len(self._selections) > 0
+                else None
+            )
+        pos = self._pos.get(self._selected)
+        return self._texts[pos] if pos is not None else None
+
+    def destroy(self):
+        if self._redraw_id is not None:
+            self.after_cancel(self._redraw_id)
+            self._redraw_id = None
+        super().destroy()
+
+    def configure(self, **kwargs):
+        """configurable options of the listbox"""
+        pool_options = {}
+        repaint = False
+        if "hover_color" in kwargs:
+            self.hover_color = pool_options["hover_color"] = kwargs.pop("hover_color")
+        if "button_color" in kwargs:
+            self.button_fg_color = kwargs.pop("button_color")
+            repaint = True
+        if "highlight_color" in kwargs:
+            self.select_color = kwargs.pop("highlight_color")
+            repaint = True
+        if "text_color" in kwargs:
+            self.text_color = pool_options["text_color"] = kwargs.pop("text_color")
+        if "font" in kwargs:
+            self.font = pool_options["font"] = kwargs.pop("font")
+        if "command" in kwargs:
+            self.command = kwargs.pop("command")
+        if "hover" in kwargs:
+            self.hover = kwargs.pop("hover")
+            repaint = True
+        if "justify" in kwargs:
+            self.justify = pool_options["anchor"] = _resolve_justify(kwargs.pop("justify"))
+        if "multiple_selection" in kwargs:
+            self.multiple = kwargs.pop("multiple_selection")
+
+        if pool_options:
+            for button in self._pool:
+                button.configure(**pool_options)
+        if repaint:
+            self._repaint_all()
+
+        super().configure(**kwargs)
+
+    def cget(self, param):
+        if param=="hover_color":
+            return self.hover_color
+        if param=="button_color":
+            return self.button_fg_color
+        if param=="highlight_color":
+            return self.select_color
+        if param=="text_color":
+            return self.text_color
+        if param=="font":
+            return self.font
+        if param=="hover":
+            return self.hover
+        if param=="justify":
+            return self.justify
+        return super().cget(param)
+
+    def move_up(self, index):
+        """Move the option up in the listbox"""
+        if 0 < index < len(self._keys):
+            self._texts[index - 1], self._texts[index] = self._texts[index], self._texts[index - 1]
+            self.deselect(index)
+            self.select(index - 1)
+            if index - 1 < self._first:
+                self._scroll_to(index - 1)
+
+    def move_down(self, index):
+        """Move the option down in the listbox"""
+        if 0 <= index < len(self._keys) - 1:
+            self._texts[index + 1], self._texts[index] = self._texts[index], self._texts[index + 1]
+            self.deselect(index)
+            self.select(index + 1)
+            if index + 1 >= self._first + len(self._pool):
+                self._scroll_to(index + 2 - len(self._pool))
@@ -0,0 +1,148 @@
+"""
+Détection des fichiers en double dans ./assets (copies identiques d'une
+même capture dans galerie/, aboutissement/, proto/...) et déduplication.
+
+Trois étapes :
+- les fichiers sont regroupés par taille : seule une taille partagée peut
+  cacher un doublon ;
+- les candidats sont hachés par blocs via mmap, sur un pool de threads ;
+- pour chaque groupe identique, un chemin canonique est choisi, les
+  références de projects-data.js (et des shards) sont réécrites vers lui,
+  puis les copies
+  peuvent être supprimées ou remplacées par des liens physiques.
+"""
+
+import hashlib
+import mmap
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+from audit import collect_references, scan_tree
+from core import ASSET_INDEX, ROOT_DIR, map_medias, media_src
+
+# Bytes handed to the hash per update: large enough to amortize the call,
+# small enough that the memoryview never pins much of the mapping
+_HASH_CHUNK = 1 << 20
+
+
+class DuplicateGroup(NamedTuple):
+    canonical: str     # path kept, relative to the site root
+    duplicates: list   # identical copies, relative to the site root
+    size: int          # bytes of one copy
+    digest: str        # sha256 of the content
+
+
+def hash_file(path) -> str:
+    """sha256 du contenu, lu par blocs dans une projection mmap du fichier."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return h.hexdigest()  # mmap refuses empty files
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                for offset in range(0, len(mm), _HASH_CHUNK):
+                    h.update(view[offset:offset + _HASH_CHUNK])
+            finally:
+                view.release()
+    return h.hexdigest()
+
+
+def find_duplicates(files: dict[str, tuple], workers: int | None = None) -> dict[str, list[str]]:
+    """
+    Hash → chemins (au moins deux, triés) des fichiers identiques parmi
+    `files` (chemin relatif → (taille, mtime_ns), voir audit.scan_tree).
+    """
+    by_size: dict[int, list[str]] = {}
+    for path, (size, _) in files.items():
+        if size > 0:
+            by_size.setdefault(size, []).append(path)
+    candidates = [p for paths in by_size.values() if len(paths) > 1 for p in paths]
+
+    by_hash: dict[str, list[str]] = {}
+    # hashlib releases the GIL while hashing each chunk
+    with ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) * 2)) as pool:
+        for path, digest in zip(candidates, pool.map(lambda p: hash_file(ROOT_DIR / p), candidates)):
+            by_hash.setdefault(digest, []).append(path)
+    return {digest: sorted(paths) for digest, paths in by_hash.items() if len(paths) > 1}
+
+
+def plan_dedupe(data: dict, under: str = "assets/projects", workers: int | None = None,
+                cache: bool = True) -> list[DuplicateGroup]:
+    """
+    Doublons des fichiers de `under`. Le chemin canonique d'un groupe est le
+    plus référencé par `data`, puis le plus court.
+    """
+    files = scan_tree(under=under.replace("\\", "/").strip("/"), workers=workers, cache=cache)
+    uses = Counter(ASSET_INDEX.normalize(ref.path) for ref in collect_references(data))
+    groups = []
+    for digest, paths in find_duplicates(files, workers).items():
+        canonical = min(paths, key=lambda p: (-uses[p], len(p), p))
+        groups.append(DuplicateGroup(canonical, [p for p in paths if p != canonical], files[canonical][0], digest))
+    return sorted(groups)
+
+
+def rewrite_references(data: dict, groups: list[DuplicateGroup]) -> int:
+    """
+    Remplace (sur place) les références aux copies par le chemin canonique.
+    Un média enrichi garde ses informations (le contenu est le même), seul
+    son "src" change. Retourne le nombre de références changées.
+    """
+    target = {dup: g.canonical for g in groups for dup in g.duplicates}
+    changed = 0
+
+    def rewrite(entry):
+        nonlocal changed
+        path = media_src(entry)
+        if not isinstance(path, str) or not path:
+            return entry
+        canonical = target.get(ASSET_INDEX.normalize(path))
+        if canonical is None:
+            return entry
+        changed += 1
+        return {**entry, "src": canonical} if isinstance(entry, dict) else canonical
+
+    projects = data.get("projects", [])
+    for i, proj in enumerate(projects):
+        if not isinstance(proj, dict):
+            continue
+        before = changed
+        new = map_medias(proj, rewrite)
+        if changed != before:
+            projects[i] = new
+    return changed
+
+
+def remove_duplicates(groups: list[DuplicateGroup], hardlink: bool = False) -> int:
+    """
+    Supprime les copies (ou, avec `hardlink`, les remplace par un lien
+    physique vers le fichier canonique). Un fichier modifié depuis l'analyse
+    est laissé en place. Retourne le nombre d'octets libérés.
+    """
+    freed = 0
+    for group in groups:
+        canonical = ROOT_DIR / group.canonical
+        try:
+            if hash_file(canonical) != group.digest:
+                continue
+        except OSError:
+            continue
+        for dup in group.duplicates:
+            path = ROOT_DIR / dup
+            try:
+                if os.path.getsize(path) != group.size or hash_file(path) != group.digest:
+                    continue
+                if hardlink:
+                    if os.path.samefile(path, canonical):
+                        continue
+                    tmp = path.with_name(path.name + ".dedupe-tmp")
+                    os.link(canonical, tmp)
+                    os.replace(tmp, path)
+                else:
+                    os.remove(path)
+            except OSError:
+                continue
+            freed += group.size
+    return freed
@@ -0,0 +1,296 @@
+"""
+Dérivés d'images pour le site : miniatures redimensionnées en WebP (et AVIF
+si Pillow sait l'écrire) pour chaque image référencée par projects-data.js,
+et un aperçu flou de quelques centaines d'octets (data URI) que le site
+affiche pendant le chargement de l'image.
+
+Les fichiers sont nommés d'après le hash du contenu de la source
+(assets/derived/<hash>-<largeur>.<ext>) : une image inchangée n'est jamais
+retraitée, et deux copies identiques partagent leurs dérivés. Le rendu
+tourne sur un pool de processus ; le résultat est décrit dans un manifest
+(assets/data/media-manifest.js) lu par le site et par l'export enrichi
+(`cli.py save --enrich`, `cli.py bundle --enrich`).
+
+Pillow est optionnel pour le reste de l'éditeur : seul ce module en a besoin.
+"""
+
+import base64
+import hashlib
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+from core import ASSET_INDEX, CACHE_DIR, ROOT_DIR, iter_media_paths, load_cache, save_cache, write_text_atomic
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = ImageOps = None
+
+DERIVED_DIR = ROOT_DIR / "assets" / "derived"
+MANIFEST_JS = ROOT_DIR / "assets" / "data" / "media-manifest.js"
+# Sources that get derivatives; GIFs are left alone (animations)
+IMAGE_EXTENSIONS = frozenset({".png", ".jpg", ".jpeg", ".bmp", ".webp"})
+# Target widths, in pixels; an image narrower than all of them is only re-encoded
+WIDTHS = (480, 1280)
+QUALITY = {"webp": 80, "avif": 55}
+MIME_TYPES = {"webp": "image/webp", "avif": "image/avif"}
+# Placeholder: longest side in pixels, upscaled (hence blurred) by the browser
+PLACEHOLDER_SIZE = 16
+PLACEHOLDER_QUALITY = 40
+
+_MANIFEST_VERSION = 1
+_JS_PREFIX = "window.MEDIA_MANIFEST = "
+_HASH_CACHE_VERSION = 1
+_HASH_CACHE = CACHE_DIR / "derivatives-hashes.marshal"
+_HASH_CHUNK = 1 << 20
+
+
+class Variant(NamedTuple):
+    src: str     # POSIX path relative to the site root
+    type: str    # MIME type
+    width: int
+    height: int
+    bytes: int
+
+
+class DeriveReport(NamedTuple):
+    manifest: dict
+    rendered: list   # source paths processed in this run
+    reused: list     # source paths whose derivatives were already up to date
+    skipped: list    # (source path, reason)
+    failed: int      # sources that could not be rendered (nothing pruned then)
+    removed: list    # stale derived files deleted
+
+
+def avif_supported() -> bool:
+    """True si Pillow (ou pillow-avif-plugin) sait écrire de l'AVIF."""
+    if Image is None:
+        return False
+    try:
+        import pillow_avif  # noqa: F401  registers the AVIF plugin on import
+    except ImportError:
+        pass
+    Image.init()
+    return "AVIF" in Image.SAVE
+
+
+def _settings(formats: tuple[str, ...]) -> dict:
+    # Anything here changing invalidates every derivative
+    return {"widths": list(WIDTHS), "formats": list(formats), "quality": {f: QUALITY[f] for f in formats},
+            "placeholder": [PLACEHOLDER_SIZE, PLACEHOLDER_QUALITY]}
+
+
+# ------------------------------
+# Manifest
+# ------------------------------
+
+def load_manifest(path=MANIFEST_JS) -> dict:
+    """Manifest `window.MEDIA_MANIFEST = {...};`, ou un manifest vide."""
+    try:
+        text = Path(path).read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return {"version": _MANIFEST_VERSION, "media": {}}
+    start = text.find("{")
+    if not text.startswith(_JS_PREFIX) or start < 0:
+        raise ValueError(f"{path} : le fichier ne contient pas une assignation window.MEDIA_MANIFEST = {{...}};")
+    manifest, _ = json.JSONDecoder().raw_decode(text, start)
+    return manifest
+
+
+def dump_manifest(manifest: dict) -> str:
+    # Sorted and one entry per line: the file is committed, diffs stay small
+    return _JS_PREFIX + json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True) + ";\n"
+
+
+# ------------------------------
+# Source hashes
+# ------------------------------
+
+def _hash_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK):
+            h.update(chunk)
+    return h.hexdigest()[:32]
+
+
+def source_hashes(paths: list[str], workers: int | None = None, cache: bool = True) -> dict[str, str]:
+    """
+    Hash du contenu de chaque chemin (relatif à la racine du site). Un fichier
+    dont la taille et le mtime n'ont pas changé garde le hash en cache.
+    """
+    old = load_cache(_HASH_CACHE, _HASH_CACHE_VERSION, {}) if cache else {}
+    hashes, todo, stats = {}, [], {}
+    for rel in paths:
+        try:
+            st = os.stat(ROOT_DIR / rel)
+        except OSError:
+            continue
+        stats[rel] = (st.st_size, st.st_mtime_ns)
+        cached = old.get(rel)
+        if cached is not None and cached[:2] == stats[rel]:
+            hashes[rel] = cached[2]
+        else:
+            todo.append(rel)
+    # hashlib releases the GIL on large buffers: threads are enough here
+    with ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) * 2)) as pool:
+        for rel, digest in zip(todo, pool.map(lambda p: _hash_file(ROOT_DIR / p), todo)):
+            hashes[rel] = digest
+    if cache:
+        new = {rel: (*stats[rel], digest) for rel, digest in hashes.items()}
+        if new != old:
+            save_cache(_HASH_CACHE, _HASH_CACHE_VERSION, new)
+    return hashes
+
+
+# ------------------------------
+# Rendering (worker processes)
+# ------------------------------
+
+def _target_widths(width: int) -> list[int]:
+    return [w for w in WIDTHS if w < width] or [width]
+
+
+def placeholder_uri(im) -> str:
+    """Aperçu de `im` en WebP minuscule, sous forme de data URI."""
+    width, height = im.size
+    scale = PLACEHOLDER_SIZE / max(width, height)
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    # BOX averages every source pixel: the downscale is the blur
+    small = im.resize(size, Image.BOX)
+    buf = io.BytesIO()
+    small.save(buf, "WEBP", quality=PLACEHOLDER_QUALITY)
+    return "data:image/webp;base64," + base64.b64encode(buf.getvalue()).decode("ascii")
+
+
+def render_derivatives(source: str, stem: str,
+                       formats: tuple[str, ...]) -> tuple[int, int, list[Variant], str]:
+    """
+    Écrit les dérivés de `source` (chemin absolu) sous DERIVED_DIR/<stem>-<largeur>.<ext>.
+    Retourne la taille de l'original, les variantes gardées (un dérivé plus
+    lourd que la source n'apporte rien et est supprimé) et l'aperçu flou.
+    Exécuté dans les processus du pool.
+    """
+    if "avif" in formats:
+        avif_supported()  # the plugin must be registered in this process too
+    source_bytes = os.path.getsize(source)
+    with Image.open(source) as im:
+        im = ImageOps.exif_transpose(im)
+        if im.mode not in ("RGB", "RGBA"):
+            im = im.convert("RGBA" if im.mode in ("P", "LA", "PA") or "transparency" in im.info else "RGB")
+        width, height = im.size
+        variants = []
+        for target in _target_widths(width):
+            size = (target, max(1, round(height * target / width)))
+            resized = im if size == im.size else im.resize(size, Image.LANCZOS)
+            for fmt in formats:
+                name = f"{stem}-{target}.{fmt}"
+                out = DERIVED_DIR / name
+                tmp = out.with_name(name + ".part")
+                resized.save(tmp, fmt.upper(), quality=QUALITY[fmt])
+                nbytes = os.path.getsize(tmp)
+                if nbytes >= source_bytes:
+                    os.remove(tmp)
+                    continue
+                os.replace(tmp, out)
+                variants.append(Variant(f"assets/derived/{name}", MIME_TYPES[fmt], *size, nbytes))
+        placeholder = placeholder_uri(im)
+    return width, height, variants, placeholder
+
+
+# ------------------------------
+# Build
+# ------------------------------
+
+def referenced_images(data: dict) -> list[str]:
+    """Chemins normalisés (sans doublon, dans l'ordre) des images de ./assets référencées."""
+    seen = {}
+    for proj in data.get("projects", []):
+        for _, path in iter_media_paths(proj):
+            rel = ASSET_INDEX.normalize(path) if path else None
+            if rel is not None and os.path.splitext(rel)[1].lower() in IMAGE_EXTENSIONS:
+                seen.setdefault(rel, None)
+    return list(seen)
+
+
+def _up_to_date(entry: dict | None, digest: str) -> bool:
+    return (
+        entry is not None
+        and entry.get("hash") == digest
+        and all((ROOT_DIR / v["src"]).is_file() for v in entry.get("variants", []))
+    )
+
+
+def build_derivatives(data: dict, workers: int | None = None, cache: bool = True,
+                      manifest_path=MANIFEST_JS, prune: bool = True) -> DeriveReport:
+    """
+    Génère les dérivés manquants des images référencées par `data` et
+    réécrit le manifest. Avec `prune`, les dérivés qui ne correspondent plus à
+    aucune source sont supprimés, mais seulement si toutes les images ont pu
+    être rendues : après un échec, les anciens dérivés restent en place.
+    """
+    if Image is None:
+        raise RuntimeError("Pillow est nécessaire pour générer les dérivés : pip install Pillow")
+    formats = ("webp", "avif") if avif_supported() else ("webp",)
+    settings = _settings(formats)
+
+    try:
+        old = load_manifest(manifest_path)
+    except ValueError:
+        old = {}
+    old_media = old.get("media", {}) if cache and old.get("settings") == settings else {}
+    # Entries by content hash: a copy of an already processed image is free
+    by_hash = {e["hash"]: e for e in old_media.values() if "hash" in e}
+
+    paths = referenced_images(data)
+    hashes = source_hashes(paths, cache=cache)
+    media, rendered, reused, skipped, failed = {}, [], [], [], 0
+    jobs: dict[str, list[str]] = {}  # hash -> source paths
+    for rel in paths:
+        digest = hashes.get(rel)
+        if digest is None:
+            skipped.append((rel, "fichier introuvable"))
+            continue
+        entry = old_media.get(rel) or by_hash.get(digest)
+        if _up_to_date(entry, digest):
+            media[rel] = entry
+            reused.append(rel)
+        else:
+            jobs.setdefault(digest, []).append(rel)
+
+    if jobs:
+        os.makedirs(DERIVED_DIR, exist_ok=True)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                digest: pool.submit(render_derivatives, str(ROOT_DIR / rels[0]), digest, formats)
+                for digest, rels in jobs.items()
+            }
+            for digest, future in futures.items():
+                try:
+                    width, height, variants, placeholder = future.result()
+                except Exception as e:  # unreadable or unsupported image
+                    skipped.extend((rel, f"{type(e).__name__}: {e}") for rel in jobs[digest])
+                    failed += len(jobs[digest])
+                    continue
+                entry = {"hash": digest, "width": width, "height": height,
+                         "variants": [v._asdict() for v in variants], "placeholder": placeholder}
+                for rel in jobs[digest]:
+                    media[rel] = entry
+                    rendered.append(rel)
+
+    manifest = {"version": _MANIFEST_VERSION, "settings": settings, "media": media}
+    if manifest != old:
+        write_text_atomic(manifest_path, dump_manifest(manifest))
+
+    removed = []
+    if prune and not failed and DERIVED_DIR.is_dir():
+        keep = {Path(v["src"]).name for e in media.values() for v in e["variants"]}
+        for entry in os.scandir(DERIVED_DIR):
+            if entry.is_file() and entry.name not in keep:
+                os.remove(entry.path)
+                removed.append(f"assets/derived/{entry.name}")
+    return DeriveReport(manifest, rendered, reused, skipped, failed, removed)
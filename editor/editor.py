@@ -1,77 +1,59 @@
+import difflib
 import json
+import os
 import re
-from pathlib import Path
+from collections import OrderedDict
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import customtkinter as ctk
 
 # Prefer Akascape's CTkListbox if available. Fallback to tk.Listbox (stable).
+# Long lists use CTkVirtualListbox, which recycles a fixed pool of row widgets.
 try:
-    from ctk_listbox import CTkListbox  # https://github.com/Akascape/CTkListbox
+    from ctk_listbox import CTkListbox, CTkVirtualListbox  # https://github.com/Akascape/CTkListbox
 except Exception:
     CTkListbox = None
-
-import sys, os
-
-current_dir = os.path.dirname(os.path.abspath(__file__))
-exec_dir = os.path.dirname(current_dir)
-os.chdir(exec_dir)
-sys.path.insert(0, exec_dir)
+    CTkVirtualListbox = None
+
+from core import (
+    ASSET_INDEX,
+    ASSETS_DIR,
+    LEGACY_PROJECTS_JSON,
+    PATH_FIELDS,
+    PROJECTS_JSON,
+    ROOT_DIR,
+    FragmentCache,
+    default_project,
+    default_section,
+    ensure_assets_dir,
+    file_hash,
+    load_projects_cached,
+    normalize_asset_path,
+    save_projects_file,
+    snapshot,
+)
+from history import MISSING, Edit, History, invert_edit
+from journal import Journal
+from model import Node, Project, Section, to_model
+from saver import BackgroundSaver
+from shards import ShardStore
+from validation import ProjectValidator
 
 # ------------------------------
 # Config
 # ------------------------------
 APP_TITLE = "projects-data.js Editor"
-PROJECTS_JSON = "./assets/data/projects-data.js"
-ASSETS_DIR = Path("./assets").resolve()
+# Nombre de projets dont les widgets d'édition restent construits en cache
+EDITOR_CACHE_SIZE = 4
+# Suffixe des ids de projets dupliqués ("x-copy", "x-copy-2", ...)
+_COPY_SUFFIX_RE = re.compile(r"-copy(?:-\d+)?$")
+# Mémoire maximale de l'historique annuler/rétablir (les plus anciennes étapes sont oubliées)
+HISTORY_MAX_BYTES = 32 * 1024 * 1024
 
 # ------------------------------
 # Helpers
 # ------------------------------
 
-_JS_ASSIGN_RE = re.compile(
-    r"""^\s*window\s*\.\s*PROJECTS_DATA\s*=\s*(\{.*\})\s*;?\s*$""",
-    re.DOTALL,
-)
-
-def parse_projects_js(text: str) -> dict:
-    """
-    Extrait l'objet JSON du fichier JS `window.PROJECTS_DATA = {...};`
-    et le retourne sous forme de dict Python.
-    Lève ValueError si le format ne correspond pas.
-    """
-    m = _JS_ASSIGN_RE.match(text)
-    if not m:
-        raise ValueError("Le fichier ne contient pas une assignation window.PROJECTS_DATA = {...};")
-    json_str = m.group(1)
-    return json.loads(json_str)
-
-def dump_projects_js(data: dict) -> str:
-    """
-    Sérialise le dict Python en JS avec le wrapper window.PROJECTS_DATA = ...;
-    """
-    return "window.PROJECTS_DATA = " + json.dumps(data, ensure_ascii=False, indent=2) + ";\n"
-
-
-def ensure_assets_dir():
-    ASSETS_DIR.mkdir(parents=True, exist_ok=True)
-
-
-def is_in_assets(path: Path) -> bool:
-    try:
-        return path.resolve().is_file() and ASSETS_DIR in path.resolve().parents
-    except Exception:
-        return False
-
-
-def to_relative_posix(path: Path) -> str:
-    try:
-        rel = path.resolve().relative_to(Path.cwd().resolve())
-    except Exception:
-        rel = path.name
-    return Path(rel).as_posix()
-
-
 def browse_in_assets(filetypes=(
     ("Images / Videos", "*.png *.jpg *.jpeg *.gif *.webp *.mp4 *.mov *.webm"),
     ("All files", "*.*"),
@@ -84,57 +66,80 @@ def browse_in_assets(filetypes=(
     )
     if not filename:
         return None
-    p = Path(filename)
-    if not is_in_assets(p):
+    rel = ASSET_INDEX.lookup(filename, fresh=True)
+    if rel is None:
         messagebox.showerror(
             APP_TITLE,
             "Le fichier sélectionné doit être situé dans ./assets ou l'un de ses sous-dossiers.",
         )
         return None
-    return to_relative_posix(p)
+    return rel
 
 
 # ------------------------------
-# Data Model
+# Small adapters to normalize CTkListbox / tk.Listbox
 # ------------------------------
 
-def default_project() -> dict:
-    return {
-        "id": "nouveau-projet",
-        "title": "Nouveau Projet",
-        "category": "autre",
-        "icon": "./assets/images/placeholder.png",
-        "description": "",
-        "media": "./assets/images/placeholder.png",
-        "sections": [],
-        "medias": [],
-    }
+def lb_insert_many(lb, index, items):
+    try:
+        lb.insert_many(index, items)  # CTkListbox / CTkVirtualListbox
+    except AttributeError:
+        lb.insert(index, *items)  # tk.Listbox
 
 
-def default_section() -> dict:
-    return {
-        "title": "Nouvelle section",
-        "description": "",
-        "medias": [],
-    }
+def lb_relabel(lb, index, text):
+    try:
+        lb.relabel(index, text)  # CTkListbox / CTkVirtualListbox
+    except AttributeError:
+        lb.delete(index)  # tk.Listbox
+        lb.insert(index, text)
 
 
-# ------------------------------
-# Small adapters to normalize CTkListbox / tk.Listbox
-# ------------------------------
-
-def lb_delete_all(lb):
-    try:
-        lb.delete("all")  # CTkListbox
-    except Exception:
-        lb.delete(0, tk.END)  # tk.Listbox
+def diff_rows(old_rows: list[tuple], new_rows: list[tuple]) -> list[tuple]:
+    """
+    Calcule les opérations qui transforment les lignes `old_rows` en `new_rows`
+    (listes de couples (clé, libellé)), appariées par clé.
+    Les opérations sont rendues de la fin vers le début, pour que les index
+    restent valides pendant qu'on les applique :
+    ("relabel", i, libellé), ("delete", i, j) et ("insert", i, [libellés]).
+    """
+    ops = []
+    matcher = difflib.SequenceMatcher(
+        None, [k for k, _ in old_rows], [k for k, _ in new_rows], autojunk=False
+    )
+    for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+        if tag == "equal":
+            for k in reversed(range(i2 - i1)):
+                if old_rows[i1 + k][1] != new_rows[j1 + k][1]:
+                    ops.append(("relabel", i1 + k, new_rows[j1 + k][1]))
+            continue
+        if i2 > i1:
+            ops.append(("delete", i1, i2 - 1))
+        if j2 > j1:
+            ops.append(("insert", i1, [label for _, label in new_rows[j1:j2]]))
+    return ops
+
+
+def lb_sync(lb, old_rows: list[tuple], new_rows: list[tuple]):
+    """Applique à la listbox uniquement les lignes modifiées entre old_rows et new_rows."""
+    for op in diff_rows(old_rows, new_rows):
+        if op[0] == "relabel":
+            lb_relabel(lb, op[1], op[2])
+        elif op[0] == "delete":
+            lb.delete(op[1], op[2])
+        else:
+            lb_insert_many(lb, op[1], op[2])
 
 
-def lb_insert_end(lb, text):
-    try:
-        lb.insert("end", text)  # CTkListbox
-    except Exception:
-        lb.insert(tk.END, text)  # tk.Listbox
+def keyed_rows(keys, labels) -> list[tuple]:
+    """Associe chaque libellé à sa clé, en numérotant les clés répétées."""
+    seen = {}
+    rows = []
+    for key, label in zip(keys, labels):
+        n = seen.get(key, 0)
+        seen[key] = n + 1
+        rows.append(((key, n), label))
+    return rows
 
 
 def lb_size(lb) -> int:
@@ -250,6 +255,7 @@ class ListWithPickers(ctk.CTkFrame):
 
         self.items_frame = ctk.CTkScrollableFrame(self)
         self.items_frame.grid(row=1, column=0, padx=8, pady=(0, 8), sticky="nsew")
+        self.items_frame.columnconfigure(0, weight=1)
         self.rowconfigure(1, weight=1)
 
         btns = ctk.CTkFrame(self)
@@ -262,17 +268,7 @@ class ListWithPickers(ctk.CTkFrame):
         self.rows: list[dict] = []
         self.selected_index = tk.IntVar(value=-1)
 
-    def _rebuild_indices(self):
-        for i, rowd in enumerate(self.rows):
-            old_rb = rowd.get("rb")
-            if old_rb is not None:
-                old_rb.destroy()
-            rb = ctk.CTkRadioButton(rowd["frame"], text=str(i + 1), variable=self.selected_index, value=i)
-            rb.grid(row=0, column=0, padx=(0, 6), pady=4)
-            rowd["rb"] = rb
-
-    def add_item(self, value: str | None = None):
-        idx = len(self.rows)
+    def _make_row(self, idx: int, value: str | None = None) -> dict:
         row = ctk.CTkFrame(self.items_frame)
         row.columnconfigure(1, weight=1)
         rb = ctk.CTkRadioButton(row, text=str(idx + 1), variable=self.selected_index, value=idx)
@@ -283,9 +279,16 @@ class ListWithPickers(ctk.CTkFrame):
         entry.grid(row=0, column=1, padx=(0, 6), pady=4, sticky="ew")
         if value:
             entry.insert(0, value)
-        row.pack(fill="x", padx=0, pady=2)
-        self.rows.append({"frame": row, "rb": rb, "entry": entry})
-        self._rebuild_indices()
+        row.grid(row=idx, column=0, padx=0, pady=2, sticky="ew")
+        return {"frame": row, "rb": rb, "entry": entry}
+
+    def _place_row(self, rowd: dict, idx: int):
+        # Renumber and move a row in place instead of recreating its widgets.
+        rowd["rb"].configure(text=str(idx + 1), value=idx)
+        rowd["frame"].grid_configure(row=idx)
+
+    def add_item(self, value: str | None = None):
+        self.rows.append(self._make_row(len(self.rows), value))
 
     def _remove_row(self, row_frame):
         for i, rowd in enumerate(self.rows):
@@ -293,7 +296,15 @@ class ListWithPickers(ctk.CTkFrame):
                 rowd["frame"].destroy()
                 del self.rows[i]
                 break
-        self._rebuild_indices()
+        else:
+            return
+        for j in range(i, len(self.rows)):
+            self._place_row(self.rows[j], j)
+        selected = self.selected_index.get()
+        if selected == i:
+            self.selected_index.set(-1)
+        elif selected > i:
+            self.selected_index.set(selected - 1)
 
     def _browse_into(self, entry):
         chosen = browse_in_assets()
@@ -309,12 +320,9 @@ class ListWithPickers(ctk.CTkFrame):
         if not (0 <= new_idx < len(self.rows)):
             return
         self.rows[idx], self.rows[new_idx] = self.rows[new_idx], self.rows[idx]
-        for rowd in self.rows:
-            rowd["frame"].pack_forget()
-        for rowd in self.rows:
-            rowd["frame"].pack(fill="x", padx=0, pady=2)
+        self._place_row(self.rows[idx], idx)
+        self._place_row(self.rows[new_idx], new_idx)
         self.selected_index.set(new_idx)
-        self._rebuild_indices()
 
     def get_list(self) -> list[str]:
         values = []
@@ -325,12 +333,19 @@ class ListWithPickers(ctk.CTkFrame):
         return values
 
     def set_list(self, values: list[str]):
-        for rowd in self.rows:
-            rowd["frame"].destroy()
-        self.rows.clear()
+        # Existing rows are reused: only the surplus is destroyed and only the
+        # missing rows are created.
+        values = list(values or [])
         self.selected_index.set(-1)
-        for v in values or []:
-            self.add_item(v)
+        for rowd in self.rows[len(values):]:
+            rowd["frame"].destroy()
+        del self.rows[len(values):]
+        for rowd, v in zip(self.rows, values):
+            rowd["entry"].delete(0, tk.END)
+            if v:
+                rowd["entry"].insert(0, v)
+        for i in range(len(self.rows), len(values)):
+            self.rows.append(self._make_row(i, values[i]))
 
 
 class SectionsPanel(ctk.CTkFrame):
@@ -339,13 +354,13 @@ class SectionsPanel(ctk.CTkFrame):
         self.on_change = on_change
         self.columnconfigure(0, weight=1)
         self.rowconfigure(3, weight=1)
-        self._using_ctklistbox = CTkListbox is not None
-        self._pending_refresh_id = None
+        self._using_ctklistbox = CTkVirtualListbox is not None
         self._block_section_select = False
+        self._section_rows: list[tuple] = []
 
         ctk.CTkLabel(self, text="Sections").grid(row=0, column=0, padx=8, pady=(8, 4), sticky="w")
         if self._using_ctklistbox:
-            self.sections_list = CTkListbox(self, command=lambda _sel: self._on_section_selected())
+            self.sections_list = CTkVirtualListbox(self, command=lambda _sel: self._on_section_selected())
         else:
             self.sections_list = tk.Listbox(self, activestyle="dotbox")
             self.sections_list.bind("<<ListboxSelect>>", lambda e: self._on_section_selected())
@@ -378,34 +393,28 @@ class SectionsPanel(ctk.CTkFrame):
         self._last_selected: int | None = None
 
     # ---- Public API ----
-    def set_sections(self, sections: list[dict]):
-        self.current_sections = [json.loads(json.dumps(s)) for s in (sections or [])]
-
-        def _do_refresh():
-            if not self.winfo_exists():
-                return
-            self._block_section_select = True
-            lb_delete_all(self.sections_list)
-            for i, sec in enumerate(self.current_sections):
-                lb_insert_end(self.sections_list, f"{i+1:02d} · {sec.get('title','(sans titre)')}")
-            self._last_selected = None
-            if self.current_sections:
-                lb_select_set(self.sections_list, 0)
-                self._block_section_select = False
-                self._load_selected()
-            else:
-                self._block_section_select = False
-                self._clear_editor()
-
-        if self._using_ctklistbox:
-            if self._pending_refresh_id is not None:
-                try:
-                    self.after_cancel(self._pending_refresh_id)
-                except Exception:
-                    pass
-            self._pending_refresh_id = self.after(200, _do_refresh)
+    def set_sections(self, sections: list[dict], select: int = 0):
+        # Shallow copies: section dicts are replaced, never modified in place
+        self.current_sections = [dict(s) for s in (sections or [])]
+
+        # Rows are keyed by position: only relabelled, added or removed rows
+        # are touched in the listbox.
+        rows = [
+            ((i, 0), f"{i+1:02d} · {sec.get('title','(sans titre)')}")
+            for i, sec in enumerate(self.current_sections)
+        ]
+        self._block_section_select = True
+        lb_sync(self.sections_list, self._section_rows, rows)
+        self._section_rows = rows
+        self._last_selected = None
+        if self.current_sections:
+            lb_clear_selection(self.sections_list)
+            lb_select_set(self.sections_list, max(0, min(select, len(rows) - 1)))
+            self._block_section_select = False
+            self._load_selected()
         else:
-            _do_refresh()
+            self._block_section_select = False
+            self._clear_editor()
 
     def get_sections(self) -> list[dict]:
         idx = self._selected_index()
@@ -419,7 +428,7 @@ class SectionsPanel(ctk.CTkFrame):
         if idx is not None:
             self._save_editor_into(idx)
         self.current_sections.append(default_section())
-        self.set_sections(self.current_sections)
+        self.set_sections(self.current_sections, select=len(self.current_sections) - 1)
         if callable(self.on_change):
             self.on_change()
 
@@ -428,8 +437,8 @@ class SectionsPanel(ctk.CTkFrame):
         if idx is None:
             return
         self._save_editor_into(idx)
-        self.current_sections.insert(idx + 1, json.loads(json.dumps(self.current_sections[idx])))
-        self.set_sections(self.current_sections)
+        self.current_sections.insert(idx + 1, dict(self.current_sections[idx]))
+        self.set_sections(self.current_sections, select=idx + 1)
         if callable(self.on_change):
             self.on_change()
 
@@ -439,7 +448,7 @@ class SectionsPanel(ctk.CTkFrame):
             return
         self._save_editor_into(idx)
         del self.current_sections[idx]
-        self.set_sections(self.current_sections)
+        self.set_sections(self.current_sections, select=idx)
         if callable(self.on_change):
             self.on_change()
 
@@ -495,8 +504,91 @@ class SectionsPanel(ctk.CTkFrame):
 # ------------------------------
 # Main App
 # ------------------------------
+class ProjectView:
+    """
+    Widgets d'édition d'un projet : colonne centrale et panneau des sections.
+    ProjectsEditor en garde plusieurs construits (LRU) pour changer de projet
+    sans tout détruire et reconstruire.
+    """
+
+    def __init__(self, master, on_change=None, on_edit=None):
+        self.center = ctk.CTkFrame(master)
+        self.center.columnconfigure(0, weight=1)
+        for r in (0, 1, 2, 3, 4, 5, 6):
+            self.center.rowconfigure(r, weight=0)
+        self.center.rowconfigure(6, weight=1)
+
+        self.p_id = LabeledEntry(self.center, "ID")
+        self.p_title = LabeledEntry(self.center, "Titre")
+        self.p_category = LabeledEntry(self.center, "Catégorie")
+        self.p_icon = PathPicker(self.center, "Icône (image)")
+        self.p_media = PathPicker(self.center, "Média principal")
+        self.p_desc = TextArea(self.center, "Description (textarea)")
+        self.p_medias = ListWithPickers(self.center, "Galerie du projet (images/vidéos)")
+
+        self.p_id.grid(row=0, column=0, sticky="ew")
+        self.p_title.grid(row=1, column=0, sticky="ew")
+        self.p_category.grid(row=2, column=0, sticky="ew")
+        self.p_icon.grid(row=3, column=0, sticky="ew")
+        self.p_media.grid(row=4, column=0, sticky="ew")
+        self.p_desc.grid(row=5, column=0, sticky="nsew")
+        self.p_medias.grid(row=6, column=0, sticky="nsew")
+
+        # Right: sections
+        self.sections_panel = SectionsPanel(master, on_change=on_change)
+
+        # Project fields edited as plain values, by JSON key
+        self.fields = {
+            "id": self.p_id,
+            "title": self.p_title,
+            "category": self.p_category,
+            "icon": self.p_icon,
+            "media": self.p_media,
+            "description": self.p_desc,
+        }
+        if callable(on_edit):
+            for name, widget in [
+                ("id", self.p_id.entry), ("title", self.p_title.entry),
+                ("category", self.p_category.entry), ("icon", self.p_icon.entry),
+                ("media", self.p_media.entry), ("description", self.p_desc.text),
+            ]:
+                widget.bind("<KeyRelease>", lambda e, f=name: on_edit(f))
+
+    def show(self):
+        self.center.grid(row=1, column=1, sticky="nsew")
+        self.sections_panel.grid(row=1, column=2, sticky="nsew")
+
+    def hide(self):
+        self.center.grid_remove()
+        self.sections_panel.grid_remove()
+
+    def destroy(self):
+        self.center.destroy()
+        self.sections_panel.destroy()
+
+    def load(self, proj: dict):
+        self.p_id.set(proj.get("id", ""))
+        self.p_title.set(proj.get("title", ""))
+        self.p_category.set(proj.get("category", ""))
+        self.p_icon.set(proj.get("icon", ""))
+        self.p_media.set(proj.get("media", ""))
+        self.p_desc.set(proj.get("description", ""))
+        self.p_medias.set_list(proj.get("medias", []))
+        self.sections_panel.set_sections(proj.get("sections", []))
+
+    def clear(self):
+        self.p_id.set("")
+        self.p_title.set("")
+        self.p_category.set("")
+        self.p_icon.set("")
+        self.p_media.set("")
+        self.p_desc.set("")
+        self.p_medias.set_list([])
+        self.sections_panel.set_sections([])
+
+
 class ProjectsEditor(ctk.CTk):
-    def __init__(self):
+    def __init__(self, cache_size: int = EDITOR_CACHE_SIZE, history_max_bytes: int = HISTORY_MAX_BYTES):
         super().__init__()
         ctk.set_appearance_mode("system")
         ctk.set_default_color_theme("blue")
@@ -508,6 +600,7 @@ class ProjectsEditor(ctk.CTk):
         self.data = {"projects": []}
         self._current_project_index: int | None = None
         self._block_project_select = False
+        self._project_rows: list[tuple] = []
 
         # Top bar
         top = ctk.CTkFrame(self)
@@ -531,66 +624,62 @@ class ProjectsEditor(ctk.CTk):
         left.rowconfigure(1, weight=1)
         left.columnconfigure(0, weight=1)
         ctk.CTkLabel(left, text="Projets").grid(row=0, column=0, padx=8, pady=(8, 4), sticky="w")
-        if CTkListbox is not None:
-            self.projects_list = CTkListbox(left, command=lambda _sel: self.on_project_selected())
+        if CTkVirtualListbox is not None:
+            self.projects_list = CTkVirtualListbox(left, command=lambda _sel: self.on_project_selected())
         else:
             self.projects_list = tk.Listbox(left, activestyle="dotbox")
             self.projects_list.bind("<<ListboxSelect>>", lambda e: self.on_project_selected())
         self.projects_list.grid(row=1, column=0, padx=8, pady=(0, 8), sticky="nsew")
+        # Errors of the selected project (rows with errors are marked ⚠)
+        self.errors_label = ctk.CTkLabel(left, text="", text_color="#d9534f", justify="left", anchor="w", wraplength=260)
+        self.errors_label.grid(row=2, column=0, padx=8, pady=(0, 8), sticky="ew")
+
+        # Center + right: project editor and sections, cached per project
+        self.cache_size = max(1, cache_size)
+        self._views: OrderedDict[int, tuple[dict, ProjectView]] = OrderedDict()
+        self.view = self._new_view()
+        self.view.show()
+
+        # Stockage éclaté (un fichier par projet), actif si le manifest existe
+        self.shards = ShardStore()
+        # Writes happen on a worker thread; the UI only takes a snapshot
+        self.saver = BackgroundSaver(self)
+        self._saved_hash: str | None = None
+        # Serialized projects, re-encoded only when touched (_touch_project)
+        self.fragments = FragmentCache()
+        self.history = History(max_bytes=history_max_bytes)
+        # Per-project validation, re-run only for touched projects
+        self.validator = ProjectValidator()
+        self._project_errors: list[list[str]] = []
+        # Committed edits are appended to a journal until the next save
+        self.journal = Journal()
 
-        # Center: project editor
-        self.center = ctk.CTkFrame(self)
-        self.center.grid(row=1, column=1, sticky="nsew")
-        self.center.columnconfigure(0, weight=1)
-        for r in (0, 1, 2, 3, 4, 5, 6):
-            self.center.rowconfigure(r, weight=0)
-        self.center.rowconfigure(6, weight=1)
-
-        self.p_id = LabeledEntry(self.center, "ID")
-        self.p_title = LabeledEntry(self.center, "Titre")
-        self.p_category = LabeledEntry(self.center, "Catégorie")
-        self.p_icon = PathPicker(self.center, "Icône (image)")
-        self.p_media = PathPicker(self.center, "Média principal")
-        self.p_desc = TextArea(self.center, "Description (textarea)")
-        self.p_medias = ListWithPickers(self.center, "Galerie du projet (images/vidéos)")
-
-        self.p_id.grid(row=0, column=0, sticky="ew")
-        self.p_title.grid(row=1, column=0, sticky="ew")
-        self.p_category.grid(row=2, column=0, sticky="ew")
-        self.p_icon.grid(row=3, column=0, sticky="ew")
-        self.p_media.grid(row=4, column=0, sticky="ew")
-        self.p_desc.grid(row=5, column=0, sticky="nsew")
-        self.p_medias.grid(row=6, column=0, sticky="nsew")
-
-        # Right: sections
-        self.sections_panel = SectionsPanel(self, on_change=self.mark_dirty)
-        self.sections_panel.grid(row=1, column=2, sticky="nsew")
-
-        for widget in [
-            self.p_id.entry, self.p_title.entry, self.p_category.entry,
-            self.p_icon.entry, self.p_media.entry, self.p_desc.text,
-        ]:
-            widget.bind("<KeyRelease>", lambda e: self._live_autosave_project())
         self.bind("<Control-s>", lambda e: self.save_json())
+        self.bind("<Control-z>", lambda e: self.undo())
+        self.bind("<Control-y>", lambda e: self.redo())
 
-        self.load_json()
+        self.load_json(recover=True)
 
     # --------------------------
     # Data I/O
     # --------------------------
-    def load_json(self):
+    def load_json(self, recover: bool = False):
         if not self._confirm_discard_changes():
             return
+        self.saver.wait()
         try:
-            # 1) On tente de charger le nouveau format JS (projects.js)
-            with open(PROJECTS_JSON, "r", encoding="utf-8") as f:
-                txt = f.read()
-            self.data = parse_projects_js(txt)
+            # 0) Shards + manifest s'ils existent, 1) sinon le format JS (projects.js)
+            base = None
+            if self.shards.exists():
+                self.data = self.shards.load()
+            else:
+                # Unchanged file: read from the binary cache in .cache/, hash included
+                self.data, base = load_projects_cached(PROJECTS_JSON)
 
         except FileNotFoundError:
             # 2) Si le .js n'existe pas, on tente un fallback legacy vers projects.json
             try:
-                with open("projects.json", "r", encoding="utf-8") as f:
+                with open(LEGACY_PROJECTS_JSON, "r", encoding="utf-8") as f:
                     self.data = json.load(f)
             except FileNotFoundError:
                 self.data = {"projects": []}
@@ -603,42 +692,157 @@ class ProjectsEditor(ctk.CTk):
             messagebox.showerror(APP_TITLE, f"Erreur de lecture projects.js:\n{e}")
             return
 
+        to_model(self.data)
+        if base is None:
+            base = file_hash(PROJECTS_JSON)
+        if self.shards.exists():
+            # The bundle on disk is the one the shards would produce if it
+            # was written by this editor: the first save then skips it
+            self.shards.remember_bundle(base, PROJECTS_JSON)
+        replayed = self._recover_journal(base) if recover else []
+        if replayed:
+            self.journal.resume(base, replayed)
+        else:
+            self.journal.reset(base)
+        self._current_project_index = None
+        # Hash of the bytes just read: saving without edits rewrites nothing
+        self._saved_hash = base
+        self.fragments.clear()
+        self.history.clear()
+        self.validator.clear()
+        self._drop_views()
         self.refresh_projects_list()
-        self.dirty = False
+        self.dirty = bool(replayed)
+
+    def _recover_journal(self, base: str | None) -> list[Edit]:
+        """
+        Un journal non vide au démarrage signifie que la session précédente
+        s'est arrêtée sans enregistrer : propose de rejouer ses edits.
+        """
+        journal_base, edits = self.journal.pending()
+        if not edits:
+            return []
+        if journal_base != base:
+            messagebox.showwarning(
+                APP_TITLE,
+                "Des modifications non enregistrées d'une session précédente ont été trouvées, "
+                "mais projects-data.js a changé depuis : elles sont ignorées.",
+            )
+            return []
+        if not messagebox.askyesno(
+            APP_TITLE,
+            f"La session précédente s'est arrêtée sans enregistrer ({len(edits)} modification(s)).\n"
+            "Restaurer ces modifications ?",
+        ):
+            return []
+        try:
+            self.journal.replay(self.data, edits)
+        except (LookupError, TypeError, AttributeError) as e:
+            messagebox.showerror(APP_TITLE, f"Journal illisible, modifications ignorées :\n{e}")
+            return []
+        return edits
 
 
     def save_json(self):
         idx = self._selected_project_index()
         if idx is not None:
+            # Gallery and section edits only reach the data (and journal) here
             self._write_editor_into(idx)
 
-        try:
-            js_text = dump_projects_js(self.data)
-            with open(PROJECTS_JSON, "w", encoding="utf-8") as f:
-                f.write(js_text)
-        except Exception as e:
-            messagebox.showerror(APP_TITLE, f"Erreur d'écriture projects.js:\n{e}")
-            return
-
+        # Only the projects touched since the last save are encoded here; the
+        # worker gets immutable fragments plus a copy of the other keys.
+        projects = self.data.get("projects", [])
+        fragments = self.fragments.fragments(projects)
+        ids = [p.get("id", "") for p in projects]
+        data = {k: [] if k == "projects" else snapshot(v) for k, v in self.data.items()}
         self.dirty = False
-        messagebox.showinfo(APP_TITLE, "Enregistré ✔")
+        self.title(f"{APP_TITLE} — Enregistrement…")
+        mark = self.journal.mark()
+        self.saver.submit(
+            lambda: self._write_snapshot(data, fragments, ids),
+            lambda result, error: self._on_saved(result, error, mark),
+        )
+
+    def _write_snapshot(self, data: dict, fragments: list[str], ids: list[str]) -> tuple[bool, str]:
+        """
+        Thread de sauvegarde : écrit l'instantané. Retourne (modifié, hash de
+        projects-data.js), modifié valant False si rien n'a été réécrit.
+        """
+        if self.shards.exists():
+            # Only the shards that changed are rewritten, then the bundle
+            # is rebuilt by concatenating the shard texts
+            written = self.shards.save(data, fragments, ids)
+            changed = self.shards.write_bundle(data, PROJECTS_JSON) or bool(written)
+            return changed, self.shards.bundle_hash(PROJECTS_JSON)
+        digest = save_projects_file(data, PROJECTS_JSON, last_hash=self._saved_hash, project_fragments=fragments)
+        changed, self._saved_hash = digest != self._saved_hash, digest
+        return changed, digest
+
+    def _on_saved(self, result, error, mark: tuple[int, int]):
+        if error is not None:
+            self.dirty = True
+            self.title(APP_TITLE)
+            messagebox.showerror(APP_TITLE, f"Erreur d'écriture projects.js:\n{error}")
+            return
+        changed, digest = result
+        # Edits journaled while the worker was writing are kept
+        self.journal.compact(digest, mark)
+        self.title(f"{APP_TITLE} — {'Enregistré ✔' if changed else 'Aucun changement'}")
 
 
     # --------------------------
     # Projects operations
     # --------------------------
-    def refresh_projects_list(self):
+    def refresh_projects_list(self, select: int = 0):
+        projects = self.data.get("projects", [])
+        self._project_errors, _ = self.validator.validate(projects)
+        # Rows are keyed by project id: only the rows that were added, removed
+        # or relabelled since the last refresh are touched in the listbox.
+        rows = keyed_rows(
+            (p.get("id", "") for p in projects),
+            (self._project_label(p, e) for p, e in zip(projects, self._project_errors)),
+        )
         self._block_project_select = True
-        lb_delete_all(self.projects_list)
-        for p in self.data.get("projects", []):
-            lb_insert_end(self.projects_list, f"{p.get('title','(sans titre)')}  ·  {p.get('id','')} ")
+        lb_sync(self.projects_list, self._project_rows, rows)
+        self._project_rows = rows
         self._block_project_select = False
-        if self.data.get("projects"):
-            self.select_project_index(0)
+        if projects:
+            self.select_project_index(select)
         else:
             self._current_project_index = None
             self.clear_project_editor()
 
+    @staticmethod
+    def _project_label(proj, errors: list[str]) -> str:
+        if not isinstance(proj, (dict, Node)):
+            label = f"(type {type(proj).__name__})  "  # reported by the validator
+        else:
+            label = f"{proj.get('title','(sans titre)')}  ·  {proj.get('id','')} "
+        return f"⚠ {label}" if errors else label
+
+    def _refresh_validation(self):
+        """
+        Revalide les projets touchés et ne réétiquette que les lignes dont
+        les erreurs ont changé.
+        """
+        projects = self.data.get("projects", [])
+        self._project_errors, changed = self.validator.validate(projects)
+        for i in changed:
+            if i < len(self._project_rows):
+                label = self._project_label(projects[i], self._project_errors[i])
+                if self._project_rows[i][1] != label:
+                    self._project_rows[i] = (self._project_rows[i][0], label)
+                    lb_relabel(self.projects_list, i, label)
+        self._show_errors()
+
+    def _show_errors(self):
+        idx = self._selected_project_index()
+        errors = self._project_errors[idx] if idx is not None and idx < len(self._project_errors) else []
+        shown = "\n".join(f"⚠ {e}" for e in errors[:5])
+        if len(errors) > 5:
+            shown += f"\n… et {len(errors) - 5} autre(s)"
+        self.errors_label.configure(text=shown)
+
     def select_project_index(self, index: int):
         self._block_project_select = True
         lb_clear_selection(self.projects_list)
@@ -673,67 +877,144 @@ class ProjectsEditor(ctk.CTk):
         idx = self._selected_project_index()
         if idx is None or idx < 0 or idx >= len(self.data.get("projects", [])):
             return
-        proj = self.data["projects"][idx]
-        self.p_id.set(proj.get("id", ""))
-        self.p_title.set(proj.get("title", ""))
-        self.p_category.set(proj.get("category", ""))
-        self.p_icon.set(proj.get("icon", ""))
-        self.p_media.set(proj.get("media", ""))
-        self.p_desc.set(proj.get("description", ""))
-        self.p_medias.set_list(proj.get("medias", []))
-        self.sections_panel.set_sections(proj.get("sections", []))
+        self._show_view(self._view_for(self.data["projects"][idx]))
         self.dirty = False
+        self._refresh_validation()
 
     def clear_project_editor(self):
-        self.p_id.set("")
-        self.p_title.set("")
-        self.p_category.set("")
-        self.p_icon.set("")
-        self.p_media.set("")
-        self.p_desc.set("")
-        self.p_medias.set_list([])
-        self.sections_panel.set_sections([])
+        self._drop_views()
+        self.view.clear()
+
+    # --------------------------
+    # Cached project views (LRU)
+    # --------------------------
+    def _new_view(self) -> ProjectView:
+        return ProjectView(self, on_change=self.mark_dirty, on_edit=self._live_autosave_project)
+
+    def _view_for(self, proj: dict) -> ProjectView:
+        # Entries keep a reference to their project, so id(proj) stays unique
+        # for as long as the view is cached.
+        entry = self._views.get(id(proj))
+        if entry is not None:
+            self._views.move_to_end(id(proj))
+            return entry[1]
+        view = self._new_view()
+        view.load(proj)
+        self._views[id(proj)] = (proj, view)
+        return view
+
+    def _is_cached(self, view: ProjectView) -> bool:
+        return any(v is view for _, v in self._views.values())
+
+    def _show_view(self, view: ProjectView):
+        old = self.view
+        if old is not view:
+            old.hide()
+            view.show()
+            self.view = view
+            if not self._is_cached(old):
+                old.destroy()
+        # Evict least recently used views; the one on screen is the most recent
+        while len(self._views) > self.cache_size:
+            _, (_, evicted) = self._views.popitem(last=False)
+            evicted.destroy()
+
+    def _drop_views(self, proj: dict | None = None):
+        """Détruit les vues en cache : toutes, ou seulement celle de `proj`."""
+        keys = list(self._views) if proj is None else [id(proj)]
+        for key in keys:
+            entry = self._views.pop(key, None)
+            if entry is None:
+                continue
+            if entry[1] is self.view:
+                self._show_view(self._new_view())  # destroys the uncached view
+            else:
+                entry[1].destroy()
 
     def _write_editor_into(self, idx: int):
+        """
+        Écrit la vue du projet `idx` dans les données et enregistre les edits
+        (historique et journal). Les champs simples sont écrits à la frappe
+        (_live_autosave_project), mais la galerie et les sections ne le sont
+        qu'ici : leurs modifications n'entrent dans l'historique et le journal
+        qu'au changement de projet, à l'enregistrement, à un ajout/duplication
+        de projet ou à un annuler/rétablir. Un crash avant perd donc ces
+        modifications-là.
+        """
         if idx is None or idx < 0 or idx >= len(self.data.get("projects", [])):
             return
 
+        proj = self.data["projects"][idx]
+        entry = self._views.get(id(proj))
+        if entry is None:
+            return  # no view was built for this project, nothing was edited
+        view = entry[1]
+
+        # Paths already stored in the project were validated when written:
+        # only new or edited paths hit the filesystem.
+        known = {proj.get("icon"), proj.get("media"), *proj.get("medias", [])}
+        for sec in proj.get("sections", []):
+            known.update(sec.get("medias", []))
+
         def _validate_path(path_str: str) -> str:
-            path_str = path_str.strip()
-            if not path_str:
+            if path_str in known:
                 return path_str
-            p = Path(path_str)
-            abs_p = (Path.cwd() / p).resolve()
-            if not is_in_assets(abs_p):
-                messagebox.showerror(APP_TITLE, f"Le chemin doit être dans ./assets : {path_str}")
-                raise ValueError("invalid path")
-            return to_relative_posix(abs_p)
+            try:
+                return normalize_asset_path(path_str)
+            except ValueError as e:
+                messagebox.showerror(APP_TITLE, str(e))
+                raise
 
-        proj = self.data["projects"][idx]
+        edits = []
         try:
-            proj["id"] = self.p_id.get()
-            proj["title"] = self.p_title.get()
-            proj["category"] = self.p_category.get()
-            proj["icon"] = _validate_path(self.p_icon.get()) if self.p_icon.get() else ""
-            proj["media"] = _validate_path(self.p_media.get()) if self.p_media.get() else ""
-            proj["description"] = self.p_desc.get()
-            proj["medias"] = [_validate_path(x) for x in self.p_medias.get_list()]
-            proj["sections"] = []
-            for sec in self.sections_panel.get_sections():
-                proj["sections"].append({
-                    "title": sec.get("title", ""),
-                    "description": sec.get("description", ""),
-                    "medias": [_validate_path(x) for x in sec.get("medias", [])],
-                })
+            for field in view.fields:
+                edits += self._write_field(idx, view, field, _validate_path)
+            medias = [_validate_path(x) for x in view.p_medias.get_list()]
+            edits += self._set_project_key(idx, "medias", medias)
+            sections = [
+                Section(
+                    title=sec.get("title", ""),
+                    description=sec.get("description", ""),
+                    medias=[_validate_path(x) for x in sec.get("medias", [])],
+                )
+                for sec in view.sections_panel.get_sections()
+            ]
+            edits += self._set_project_key(idx, "sections", sections)
         except ValueError:
             return
+        finally:
+            self._record(edits)
+
+    def _set_project_key(self, idx: int, key: str, value) -> list[Edit]:
+        """
+        Remplace une clé du projet `idx` si la valeur a changé, et retourne
+        l'edit correspondant (liste vide sinon). Les projets ne sont jamais
+        modifiés plus en profondeur : l'historique partage leurs sous-objets.
+        """
+        proj = self.data["projects"][idx]
+        old = proj.get(key, MISSING)
+        if old == value:
+            return []
+        proj[key] = value
+        self._touch_project(proj)
+        return [Edit(("projects", idx, key), "set", old, value)]
+
+    def _write_field(self, idx: int, view: ProjectView, field: str, validate=normalize_asset_path) -> list[Edit]:
+        """Écrit un seul champ de la vue dans le projet. Retourne l'edit s'il a changé."""
+        value = view.fields[field].get()
+        if field in PATH_FIELDS and value:
+            value = validate(value)
+        return self._set_project_key(idx, field, value)
 
     def add_project(self):
         if self._current_project_index is not None:
             self._write_editor_into(self._current_project_index)
-        self.data.setdefault("projects", []).append(default_project())
-        self.refresh_projects_list()
-        self.select_project_index(len(self.data["projects"]) - 1)
+        proj = Project.from_dict(default_project())
+        self._touch_project(proj)
+        projects = self.data.setdefault("projects", [])
+        projects.append(proj)
+        self._record([Edit(("projects", len(projects) - 1), "insert", new=proj)])
+        self.refresh_projects_list(select=len(projects) - 1)
         self.mark_dirty()
 
     def duplicate_project(self):
@@ -741,14 +1022,26 @@ class ProjectsEditor(ctk.CTk):
         if idx is None:
             return
         self._write_editor_into(idx)
-        clone = json.loads(json.dumps(self.data["projects"][idx]))
-        clone["id"] = f"{clone.get('id','projet')}-copy"
+        # Shallow copy: nested lists and sections are never modified in place
+        # (see _set_project_key), so the clone can share them
+        clone = self.data["projects"][idx].copy()
+        self._refresh_validation()  # the id index must include pending edits
+        clone["id"] = self._copy_id(str(clone.get("id", "projet")))
         clone["title"] = f"{clone.get('title','Projet')} (copie)"
+        self._touch_project(clone)
         self.data["projects"].insert(idx + 1, clone)
-        self.refresh_projects_list()
-        self.select_project_index(idx + 1)
+        self._record([Edit(("projects", idx + 1), "insert", new=clone)])
+        self.refresh_projects_list(select=idx + 1)
         self.mark_dirty()
 
+    def _copy_id(self, project_id: str) -> str:
+        """Id libre pour une copie : x-copy, x-copy-2, ... (jamais x-copy-copy)."""
+        base = _COPY_SUFFIX_RE.sub("", project_id) + "-copy"
+        candidate, n = base, 2
+        while self.validator.has_id(candidate):
+            candidate, n = f"{base}-{n}", n + 1
+        return candidate
+
     def delete_project(self):
         idx = self._selected_project_index()
         if idx is None:
@@ -757,40 +1050,112 @@ class ProjectsEditor(ctk.CTk):
             return
         # Remove safely
         if 0 <= idx < len(self.data.get("projects", [])):
+            proj = self.data["projects"][idx]
+            self._drop_views(proj)
+            self._touch_project(proj)
             del self.data["projects"][idx]
+            self._record([Edit(("projects", idx), "delete", old=proj)])
         # Decide next selection
-        remaining = len(self.data.get("projects", []))
-        next_idx = None if remaining == 0 else min(idx, remaining - 1)
         self._current_project_index = None  # avoid saving with stale index during refresh
-        self.refresh_projects_list()
-        if next_idx is not None:
-            self.select_project_index(next_idx)
+        self.refresh_projects_list(select=idx)
+        self.mark_dirty()
+
+    # --------------------------
+    # Undo / redo
+    # --------------------------
+    def _record(self, edits: list[Edit], merge: bool = False):
+        """Enregistre des edits déjà appliqués : historique et journal."""
+        self.history.record(edits, merge=merge)
+        self.journal.append(edits)
+
+    def undo(self):
+        self._step_history(undo=True)
+
+    def redo(self):
+        self._step_history(undo=False)
+
+    def _step_history(self, undo: bool):
+        # Pending edits in the current view (gallery, sections) become the
+        # latest step first: undo reverts them, and redo then has nothing to
+        # redo since recording them clears the redo stack
+        if self._current_project_index is not None:
+            self._write_editor_into(self._current_project_index)
+        edits = self.history.undo(self.data) if undo else self.history.redo(self.data)
+        if edits is None:
+            return
+        self.journal.append([invert_edit(e) for e in reversed(edits)] if undo else edits)
+        projects = self.data.get("projects", [])
+        for edit in edits:
+            if len(edit.path) == 2:
+                # Project inserted or removed
+                for proj in (edit.old, edit.new):
+                    if proj is not MISSING:
+                        self._drop_views(proj)
+            else:
+                # Cached views of the edited project are rebuilt from the data
+                proj = projects[edit.path[1]]
+                self._touch_project(proj)
+                self._drop_views(proj)
+        # Nothing to write back from the dropped views; show where it happened
+        self._current_project_index = None
+        self.refresh_projects_list(select=edits[-1].path[1])
         self.mark_dirty()
 
     # --------------------------
     # Misc
     # --------------------------
-    def _live_autosave_project(self):
+    def _live_autosave_project(self, field: str):
+        # Only the edited field is written back; a path that is not valid yet
+        # (still being typed) stays in the widget and is reported on the next
+        # full write (project switch or save).
         idx = self._selected_project_index()
-        if idx is not None:
-            self._write_editor_into(idx)
-        self.mark_dirty()
+        if idx is None or idx >= len(self.data.get("projects", [])):
+            return
+        proj = self.data["projects"][idx]
+        entry = self._views.get(id(proj))
+        if entry is None:
+            return
+        try:
+            edits = self._write_field(idx, entry[1], field)
+        except ValueError:
+            return
+        if edits:
+            # Keystrokes in the same field within a second form one undo step
+            self._record(edits, merge=True)
+            self.mark_dirty()
+            self._refresh_validation()
+
+    def _touch_project(self, proj: dict):
+        # Every in-place mutation of a project goes through here, so that its
+        # cached fragment is re-encoded and it is validated again
+        self.fragments.touch(proj)
+        self.validator.touch(proj)
 
     def mark_dirty(self, *_):
         self.dirty = True
 
     def _confirm_discard_changes(self) -> bool:
-        if not self.dirty:
+        if not self.dirty and not self.journal.has_pending():
             return True
         return messagebox.askyesno(APP_TITLE, "Des modifications non enregistrées seront perdues. Continuer ?")
 
     def on_quit(self):
         if not self._confirm_discard_changes():
             return
+        # Let a save in progress reach its rename before the process exits
+        self.saver.wait()
+        self.journal.discard()
         self.destroy()
 
 
-if __name__ == "__main__":
+def main():
+    # Relative paths typed in the editor are relative to the site root
+    os.chdir(ROOT_DIR)
     ensure_assets_dir()
+    ASSET_INDEX.start()
     app = ProjectsEditor()
     app.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Historique annuler/rétablir de l'éditeur.
+
+Chaque modification est enregistrée comme une liste d'Edit : un chemin dans
+les données (("projects", 3, "title")), l'opération et les valeurs avant et
+après. Les valeurs sont partagées avec le modèle, jamais copiées : les
+projets ne sont modifiés qu'en remplaçant leurs clés de premier niveau
+(les listes et sections internes ne sont jamais modifiées sur place), donc
+une ancienne valeur reste valide telle quelle. Annuler ou rétablir ne coûte
+qu'un parcours du chemin.
+"""
+
+import sys
+import time
+from collections import deque
+from typing import Any, NamedTuple
+
+from model import Node
+
+# Ancienne valeur d'une clé qui n'existait pas
+MISSING = object()
+
+
+class Edit(NamedTuple):
+    path: tuple
+    op: str  # "set", "insert" (list) or "delete" (list)
+    old: Any = MISSING
+    new: Any = MISSING
+
+
+def _container(data, path: tuple):
+    node = data
+    for key in path[:-1]:
+        node = node[key]
+    return node
+
+
+def invert_edit(edit: Edit) -> Edit:
+    """Edit qui annule `edit`."""
+    op = {"set": "set", "insert": "delete", "delete": "insert"}[edit.op]
+    return Edit(edit.path, op, edit.new, edit.old)
+
+
+def apply_edit(data, edit: Edit, reverse: bool = False):
+    """Applique `edit` à `data` (ou son inverse avec `reverse`)."""
+    if reverse:
+        edit = invert_edit(edit)
+    node, key = _container(data, edit.path), edit.path[-1]
+    if edit.op == "set":
+        if edit.new is MISSING:
+            node.pop(key, None)
+        else:
+            node[key] = edit.new
+    elif edit.op == "insert":
+        node.insert(key, edit.new)
+    elif edit.op == "delete":
+        del node[key]
+    else:
+        raise ValueError(f"Opération inconnue : {edit.op}")
+
+
+def deep_sizeof(value) -> int:
+    """Taille approximative d'une valeur JSON, sous-objets compris."""
+    size = sys.getsizeof(value)
+    if isinstance(value, (dict, Node)):
+        for k, v in value.items():
+            size += sys.getsizeof(k) + deep_sizeof(v)
+    elif isinstance(value, list):
+        for v in value:
+            size += deep_sizeof(v)
+    return size
+
+
+def _edit_size(edit: Edit) -> int:
+    size = 64 + 8 * len(edit.path)
+    for value in (edit.old, edit.new):
+        if value is not MISSING:
+            size += deep_sizeof(value)
+    return size
+
+
+class History:
+    """
+    Piles annuler/rétablir, bornées en mémoire : au-delà de `max_bytes`,
+    les étapes les plus anciennes sont oubliées.
+    Les saisies successives dans un même champ (`merge=True`, à moins de
+    `merge_window` secondes d'intervalle) forment une seule étape.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, merge_window: float = 1.0):
+        self.max_bytes = max_bytes
+        self.merge_window = merge_window
+        # Steps: (edits, size in bytes)
+        self._undo: deque[tuple[list[Edit], int]] = deque()
+        self._redo: list[tuple[list[Edit], int]] = []
+        self._bytes = 0
+        self._merge_path: tuple | None = None
+        self._merge_time = 0.0
+
+    def __len__(self) -> int:
+        return len(self._undo)
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self._bytes = 0
+        self._merge_path = None
+
+    def record(self, edits: list[Edit], merge: bool = False):
+        """Enregistre une étape déjà appliquée aux données."""
+        if not edits:
+            return
+        for _, size in self._redo:
+            self._bytes -= size
+        self._redo.clear()
+
+        now = time.monotonic()
+        if (merge and len(edits) == 1 and edits[0].op == "set" and self._undo
+                and self._merge_path == edits[0].path and now - self._merge_time <= self.merge_window):
+            # Same field typed again: keep the oldest value, take the newest
+            (prev,), size = self._undo.pop()
+            self._bytes -= size
+            edits = [prev._replace(new=edits[0].new)]
+        self._merge_path = edits[0].path if merge and len(edits) == 1 else None
+        self._merge_time = now
+
+        size = sum(_edit_size(e) for e in edits)
+        self._undo.append((edits, size))
+        self._bytes += size
+        while self._bytes > self.max_bytes and len(self._undo) > 1:
+            _, size = self._undo.popleft()
+            self._bytes -= size
+
+    def undo(self, data) -> list[Edit] | None:
+        """Annule la dernière étape sur `data` ; retourne ses edits, ou None."""
+        if not self._undo:
+            return None
+        step = self._undo.pop()
+        for edit in reversed(step[0]):
+            apply_edit(data, edit, reverse=True)
+        self._redo.append(step)
+        self._merge_path = None
+        return step[0]
+
+    def redo(self, data) -> list[Edit] | None:
+        """Rétablit la dernière étape annulée ; retourne ses edits, ou None."""
+        if not self._redo:
+            return None
+        step = self._redo.pop()
+        for edit in step[0]:
+            apply_edit(data, edit)
+        self._undo.append(step)
+        self._merge_path = None
+        return step[0]
@@ -0,0 +1,131 @@
+"""
+Journal des modifications non enregistrées (write-ahead log).
+
+Chaque modification validée dans l'éditeur est ajoutée à la fin d'un
+fichier JSONL, une ligne par Edit (chemin, opération, nouvelle valeur) :
+quelques centaines d'octets au lieu de la réécriture de projects-data.js.
+La première ligne donne le hash du fichier enregistré sur lequel les edits
+s'appliquent. Après un arrêt brutal, le journal non vide permet de rejouer
+les modifications sur ce fichier ; il est compacté après chaque sauvegarde.
+"""
+
+import json
+import os
+
+from core import CACHE_DIR, write_text_atomic
+from history import MISSING, Edit, apply_edit
+from model import Project, Section, json_default
+
+JOURNAL_PATH = CACHE_DIR / "editor-journal.jsonl"
+
+
+def _encode(edit: Edit) -> str:
+    record = {"path": list(edit.path), "op": edit.op}
+    if edit.new is not MISSING:
+        record["value"] = edit.new
+    return json.dumps(record, ensure_ascii=False, default=json_default) + "\n"
+
+
+def _decode(line: str) -> Edit:
+    record = json.loads(line)
+    path, value = tuple(record["path"]), record.get("value", MISSING)
+    # Rebuild model nodes where the editor keeps them
+    if len(path) == 2 and isinstance(value, dict):
+        value = Project.from_dict(value)
+    elif len(path) == 3 and path[2] == "sections" and isinstance(value, list):
+        value = [Section.from_dict(s) if isinstance(s, dict) else s for s in value]
+    return Edit(path, record["op"], new=value)
+
+
+class Journal:
+    def __init__(self, path=JOURNAL_PATH):
+        self.path = path
+        self._file = None
+        self._header_end = 0
+        # Bumped by reset(): marks taken before a reload are stale
+        self._generation = 0
+
+    def pending(self) -> tuple[str | None, list[Edit]]:
+        """
+        Hash de base et edits d'un journal laissé par une session précédente.
+        Une dernière ligne tronquée (arrêt pendant l'écriture) est ignorée.
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return None, []
+        if not lines:
+            return None, []
+        try:
+            base = json.loads(lines[0]).get("base")
+        except ValueError:
+            return None, []
+        edits = []
+        for line in lines[1:]:
+            if not line.endswith("\n"):
+                break
+            try:
+                edits.append(_decode(line))
+            except (ValueError, KeyError):
+                break
+        return base, edits
+
+    def replay(self, data: dict, edits: list[Edit]):
+        for edit in edits:
+            apply_edit(data, edit)
+
+    def reset(self, base_hash: str | None, tail: str = ""):
+        """Recommence le journal sur le fichier de hash `base_hash`."""
+        self.close()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        header = json.dumps({"base": base_hash}) + "\n"
+        write_text_atomic(self.path, header + tail)
+        self._file = open(self.path, "ab")
+        self._header_end = len(header.encode("utf-8"))
+        self._generation += 1
+
+    def resume(self, base_hash: str | None, edits: list[Edit]):
+        """Reprend un journal rejoué : ses edits restent à enregistrer."""
+        self.reset(base_hash, "".join(_encode(e) for e in edits))
+
+    def has_pending(self) -> bool:
+        """True si des edits ont été journalisés depuis la dernière sauvegarde."""
+        return self._file is not None and self._file.tell() > self._header_end
+
+    def append(self, edits: list[Edit]):
+        if self._file is None or not edits:
+            return
+        self._file.write("".join(_encode(e) for e in edits).encode("utf-8"))
+        self._file.flush()
+
+    def mark(self) -> tuple[int, int]:
+        """Position courante, à passer à compact() une fois la sauvegarde finie."""
+        return self._generation, self._file.tell() if self._file is not None else 0
+
+    def compact(self, base_hash: str, mark: tuple[int, int]):
+        """
+        Après une sauvegarde de hash `base_hash` : oublie les edits écrits
+        avant `mark`, garde ceux arrivés pendant l'écriture.
+        """
+        generation, offset = mark
+        if self._file is None or generation != self._generation:
+            return
+        self._file.flush()
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            tail = f.read().decode("utf-8")
+        self.reset(base_hash, tail)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def discard(self):
+        """Fermeture propre : plus rien à rejouer."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
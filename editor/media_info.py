@@ -0,0 +1,190 @@
+"""
+Informations sur les médias référencés, pour l'export enrichi de
+projects-data.js : dimensions intrinsèques, poids en octets, variantes et
+aperçu flou générés par `cli.py derive` (voir derivatives.py).
+
+Les dimensions sont lues dans l'en-tête des fichiers (PNG, JPEG, GIF, WebP,
+BMP), sans décoder l'image ni dépendre de Pillow. Les fichiers sont sondés
+sur un pool de threads et le résultat est mis en cache dans .cache/ par
+(taille, mtime).
+"""
+
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+from core import ASSET_INDEX, CACHE_DIR, ROOT_DIR, iter_media_paths, load_cache, save_cache
+
+_PROBE_CACHE_VERSION = 1
+_PROBE_CACHE = CACHE_DIR / "media-info.marshal"
+# Enough for every header but JPEG, whose SOF can follow a large EXIF block
+_HEAD_BYTES = 64
+# JPEG SOFn markers (not DHT C4, JPG C8, DAC CC)
+_JPEG_SOF = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+# ------------------------------
+# Image headers
+# ------------------------------
+
+def _exif_swaps_axes(segment: bytes) -> bool:
+    """True si l'orientation EXIF d'un segment APP1 est une rotation de 90°."""
+    if not segment.startswith(b"Exif\0\0") or len(segment) < 14:
+        return False
+    tiff = segment[6:]
+    endian = {b"II": "<", b"MM": ">"}.get(tiff[:2])
+    if endian is None:
+        return False
+    (ifd,) = struct.unpack_from(endian + "I", tiff, 4)
+    if ifd + 2 > len(tiff):
+        return False
+    (count,) = struct.unpack_from(endian + "H", tiff, ifd)
+    for i in range(count):
+        pos = ifd + 2 + 12 * i
+        if pos + 12 > len(tiff):
+            break
+        tag, _, _, value = struct.unpack_from(endian + "HHIH", tiff, pos)
+        if tag == 0x0112:  # Orientation
+            return value in (5, 6, 7, 8)
+    return False
+
+
+def _jpeg_size(f) -> tuple[int, int] | None:
+    f.seek(2)
+    swap = False
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        while marker[1] == 0xFF:  # fill bytes
+            marker = marker[1:] + f.read(1)
+        kind = marker[1]
+        if kind in (0xD8, 0x01) or 0xD0 <= kind <= 0xD7:
+            continue  # markers without a length
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        (length,) = struct.unpack(">H", length_bytes)
+        if kind in _JPEG_SOF:
+            head = f.read(5)
+            if len(head) < 5:
+                return None
+            _, height, width = struct.unpack(">BHH", head)
+            return (height, width) if swap else (width, height)
+        if kind == 0xE1 and not swap:
+            swap = _exif_swaps_axes(f.read(length - 2))
+        else:
+            f.seek(length - 2, os.SEEK_CUR)
+
+
+def image_size(path) -> tuple[int, int] | None:
+    """
+    (largeur, hauteur) affichées d'une image, lues dans son en-tête (orientation
+    EXIF comprise pour le JPEG). None si le format n'est pas reconnu.
+    """
+    with open(path, "rb") as f:
+        head = f.read(_HEAD_BYTES)
+        if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+            return struct.unpack(">II", head[16:24])
+        if head[:6] in (b"GIF87a", b"GIF89a"):
+            return struct.unpack("<HH", head[6:10])
+        if head.startswith(b"BM") and len(head) >= 26:
+            width, height = struct.unpack("<ii", head[18:26])
+            return width, abs(height)  # negative height: top-down rows
+        if head.startswith(b"RIFF") and head[8:12] == b"WEBP":
+            chunk = head[12:16]
+            if chunk == b"VP8 " and len(head) >= 30:
+                width, height = struct.unpack("<HH", head[26:30])
+                return width & 0x3FFF, height & 0x3FFF
+            if chunk == b"VP8L" and len(head) >= 25:
+                (bits,) = struct.unpack("<I", head[21:25])
+                return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+            if chunk == b"VP8X" and len(head) >= 30:
+                width = int.from_bytes(head[24:27], "little") + 1
+                height = int.from_bytes(head[27:30], "little") + 1
+                return width, height
+            return None
+        if head.startswith(b"\xff\xd8"):
+            return _jpeg_size(f)
+    return None
+
+
+# ------------------------------
+# Probing
+# ------------------------------
+
+def _probe(rel: str):
+    path = ROOT_DIR / rel
+    try:
+        st = os.stat(path)
+        size = image_size(path)
+    except (OSError, struct.error):
+        return None
+    width, height = size if size else (None, None)
+    return st.st_size, st.st_mtime_ns, width, height
+
+
+def probe(paths: list[str], workers: int | None = None, cache: bool = True) -> dict[str, tuple]:
+    """
+    (octets, mtime_ns, largeur, hauteur) de chaque chemin (relatif à la racine
+    du site) ; largeur/hauteur valent None hors image. Les fichiers absents
+    sont omis. Un fichier au (taille, mtime) inchangé n'est pas rouvert.
+    """
+    old = load_cache(_PROBE_CACHE, _PROBE_CACHE_VERSION, {}) if cache else {}
+    result, todo = {}, []
+    for rel in paths:
+        cached = old.get(rel)
+        try:
+            st = os.stat(ROOT_DIR / rel)
+        except OSError:
+            continue
+        if cached is not None and cached[:2] == (st.st_size, st.st_mtime_ns):
+            result[rel] = cached
+        else:
+            todo.append(rel)
+    with ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) * 4)) as pool:
+        for rel, info in zip(todo, pool.map(_probe, todo)):
+            if info is not None:
+                result[rel] = info
+    if cache and result != old:
+        save_cache(_PROBE_CACHE, _PROBE_CACHE_VERSION, result)
+    return result
+
+
+def referenced_paths(data: dict) -> list[str]:
+    """Chemins normalisés (sans doublon, dans l'ordre) des médias de ./assets référencés."""
+    seen = {}
+    for proj in data.get("projects", []):
+        for _, path in iter_media_paths(proj):
+            rel = ASSET_INDEX.normalize(path) if path else None
+            if rel is not None:
+                seen.setdefault(rel, None)
+    return list(seen)
+
+
+def media_entries(data: dict, manifest: dict | None = None, workers: int | None = None,
+                  cache: bool = True) -> dict[str, dict]:
+    """
+    Chemin normalisé → {"width", "height", "bytes", "variants", "placeholder"}
+    pour chaque média référencé par `data`, à passer à dump_projects_js(media=...).
+    Variantes (triées par largeur) et aperçu viennent du manifest des dérivés
+    (derivatives.load_manifest) ; les clés inconnues sont omises.
+    """
+    manifest_media = (manifest or {}).get("media", {})
+    entries = {}
+    for rel, (nbytes, _, width, height) in probe(referenced_paths(data), workers, cache).items():
+        entry = {}
+        if width is not None:
+            entry["width"], entry["height"] = width, height
+        entry["bytes"] = nbytes
+        derived = manifest_media.get(rel, {})
+        variants = derived.get("variants")
+        if variants:
+            entry["variants"] = [
+                {"src": v["src"], "type": v["type"], "width": v["width"], "height": v["height"]}
+                for v in sorted(variants, key=lambda v: (v["width"], v["type"]))
+            ]
+        if derived.get("placeholder"):
+            entry["placeholder"] = derived["placeholder"]
+        entries[rel] = entry
+    return entries
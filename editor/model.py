@@ -0,0 +1,187 @@
+"""
+Modèle compact des projets : Project et Section sont des classes à
+__slots__ qui se manipulent comme des dict (get, [], items, ...), avec les
+champs connus en attributs et les éventuelles clés inconnues dans un dict
+annexe. L'ordre des clés du fichier est conservé, la conversion vers et
+depuis le JSON est donc sans perte.
+"""
+
+from typing import Any
+
+_MISSING = object()
+
+# Key orders are interned: all nodes read with the same keys share one tuple
+_ORDERS: dict[tuple, tuple] = {}
+
+
+def _intern_order(keys: tuple) -> tuple:
+    return _ORDERS.setdefault(keys, keys)
+
+
+class Node:
+    __slots__ = ("_keys", "_extra")
+    FIELDS: frozenset = frozenset()
+
+    def __init__(self, values=(), **kwargs):
+        self._keys = ()
+        self._extra = None
+        for key, value in dict(values, **kwargs).items():
+            self[key] = value
+
+    # ---- Mapping API ----
+    def __getitem__(self, key: str):
+        if key in self.FIELDS:
+            value = getattr(self, key, _MISSING)
+            if value is _MISSING:
+                raise KeyError(key)
+            return value
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key: str, value):
+        if key not in self._keys:
+            self._keys = _intern_order(self._keys + (key,))
+        if key in self.FIELDS:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key: str):
+        if key not in self._keys:
+            raise KeyError(key)
+        self._keys = _intern_order(tuple(k for k in self._keys if k != key))
+        if key in self.FIELDS:
+            delattr(self, key)
+        else:
+            del self._extra[key]
+            if not self._extra:
+                self._extra = None
+
+    def __contains__(self, key) -> bool:
+        return key in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def keys(self) -> tuple:
+        return self._keys
+
+    def values(self):
+        return [self[k] for k in self._keys]
+
+    def items(self):
+        return [(k, self[k]) for k in self._keys]
+
+    def get(self, key: str, default=None):
+        if key in self._keys:
+            return self[key]
+        return default
+
+    def pop(self, key: str, default=_MISSING):
+        if key not in self._keys:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        value = self[key]
+        del self[key]
+        return value
+
+    def setdefault(self, key: str, default=None):
+        if key not in self._keys:
+            self[key] = default
+        return self[key]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (Node, dict)):
+            return len(self) == len(other) and all(k in other and other[k] == v for k, v in self.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+    # ---- Copies / conversion ----
+    def copy(self):
+        """
+        Copie superficielle : les listes et sous-objets sont partagés (ils ne
+        sont jamais modifiés sur place, seulement remplacés).
+        """
+        new = object.__new__(type(self))
+        new._keys = self._keys
+        new._extra = dict(self._extra) if self._extra is not None else None
+        for key in self.FIELDS:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                setattr(new, key, value)
+        return new
+
+    def to_dict(self) -> dict:
+        """Forme JSON (dict), sous-objets compris, dans l'ordre des clés."""
+        return {k: to_plain(v) for k, v in self.items()}
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        # Fast path for loading: one interned key tuple, no per-key __setitem__
+        node = object.__new__(cls)
+        node._keys = _intern_order(tuple(data))
+        node._extra = None
+        fields = cls.FIELDS
+        for key, value in data.items():
+            if key in fields:
+                setattr(node, key, value)
+            else:
+                if node._extra is None:
+                    node._extra = {}
+                node._extra[key] = value
+        return node
+
+
+class Section(Node):
+    __slots__ = ("title", "description", "medias")
+    FIELDS = frozenset(__slots__)
+
+
+class Project(Node):
+    __slots__ = ("id", "title", "category", "icon", "description", "media", "sections", "medias")
+    FIELDS = frozenset(__slots__)
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        proj = super().from_dict(data)
+        sections = proj.get("sections")
+        if isinstance(sections, list):
+            proj.sections = [Section.from_dict(s) if isinstance(s, dict) else s for s in sections]
+        return proj
+
+
+def to_plain(value):
+    """Convertit récursivement les nœuds du modèle en dict/list JSON."""
+    if isinstance(value, Node):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [to_plain(v) for v in value]
+    if isinstance(value, dict):
+        return {k: to_plain(v) for k, v in value.items()}
+    return value
+
+
+def json_default(value) -> Any:
+    """Hook `default` de json.dumps/JSONEncoder pour encoder le modèle."""
+    if isinstance(value, Node):
+        return dict(value.items())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def to_model(data: dict) -> dict:
+    """Remplace, dans les données lues, les projets par des Project."""
+    projects = data.get("projects")
+    if isinstance(projects, list):
+        data["projects"] = [Project.from_dict(p) if isinstance(p, dict) else p for p in projects]
+    return data
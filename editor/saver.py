@@ -0,0 +1,72 @@
+import queue
+import threading
+
+
+class BackgroundSaver:
+    """
+    Exécute les sauvegardes sur un thread de travail unique.
+
+    `submit(job, on_done)` est appelé depuis le thread UI avec une fonction
+    qui travaille sur un instantané des données ; `on_done(result, error)`
+    est rappelé sur le thread UI (via `after()`) une fois l'écriture finie.
+    Si plusieurs sauvegardes s'accumulent pendant une écriture, seule la
+    dernière est exécutée.
+    """
+
+    def __init__(self, widget, poll_ms: int = 50):
+        self.widget = widget
+        self.poll_ms = poll_ms
+        self._cond = threading.Condition()
+        self._pending = None  # (job, on_done) not started yet
+        self._busy = False
+        self._results: queue.SimpleQueue = queue.SimpleQueue()
+        self._poll_id = None
+        self._thread = threading.Thread(target=self._run, name="projects-saver", daemon=True)
+        self._thread.start()
+
+    def submit(self, job, on_done=None):
+        with self._cond:
+            self._pending = (job, on_done)
+            self._cond.notify()
+        if self._poll_id is None:
+            self._poll_id = self.widget.after(self.poll_ms, self._poll)
+
+    def busy(self) -> bool:
+        with self._cond:
+            return self._busy or self._pending is not None
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Bloque jusqu'à la fin des sauvegardes en cours (à la fermeture)."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._busy and self._pending is None, timeout)
+
+    # ---- Worker thread ----
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending is not None)
+                job, on_done = self._pending
+                self._pending = None
+                self._busy = True
+            try:
+                result, error = job(), None
+            except Exception as e:
+                result, error = None, e
+            # Tk is not thread-safe: the UI thread picks the result up in _poll
+            self._results.put((on_done, result, error))
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+    # ---- UI thread ----
+    def _poll(self):
+        self._poll_id = None
+        while True:
+            try:
+                on_done, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if on_done is not None:
+                on_done(result, error)
+        if self.busy() or not self._results.empty():
+            self._poll_id = self.widget.after(self.poll_ms, self._poll)
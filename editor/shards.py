@@ -0,0 +1,142 @@
+"""
+Stockage éclaté des projets : un fichier JSON par projet et un manifest qui
+donne l'ordre, dans assets/data/projects/. Le bundle projects-data.js chargé
+par index.html est régénéré par simple concaténation des fragments.
+
+Une fois le manifest créé (`python editor/cli.py shard`), ce sont les shards
+qui font foi : l'éditeur les relit et n'écrit que ceux qui ont changé.
+"""
+
+import json
+import os
+import re
+
+from core import PROJECTS_JSON, ROOT_DIR, assemble_projects_js, content_hash, dump_project, write_text_atomic
+
+SHARDS_DIR = ROOT_DIR / "assets" / "data" / "projects"
+MANIFEST_NAME = "manifest.json"
+
+_UNSAFE_RE = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def shard_names(ids) -> list[str]:
+    """Nom de fichier de chaque projet, dérivé de son id et rendu unique."""
+    names, used = [], set()
+    for project_id in ids:
+        base = _UNSAFE_RE.sub("_", str(project_id)).strip("._") or "projet"
+        name, n = f"{base}.json", 2
+        while name.lower() in used or name == MANIFEST_NAME:
+            name, n = f"{base}-{n}.json", n + 1
+        used.add(name.lower())
+        names.append(name)
+    return names
+
+
+class ShardStore:
+    def __init__(self, directory=SHARDS_DIR):
+        self.directory = directory
+        # Last text known to be on disk, per file name (manifest included)
+        self._texts: dict[str, str] = {}
+        # Hash of the last bundle written, per output path
+        self._bundle_hashes: dict[str, str] = {}
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.directory, MANIFEST_NAME)
+
+    def exists(self) -> bool:
+        return os.path.isfile(self.manifest_path)
+
+    def load(self) -> dict:
+        """Relit le manifest et les shards, et retourne les données complètes."""
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            manifest_text = f.read()
+        manifest = json.loads(manifest_text)
+        texts = {MANIFEST_NAME: manifest_text}
+        data = {}
+        for key in manifest["keys"]:
+            if key != "projects":
+                data[key] = manifest["fields"][key]
+                continue
+            projects = []
+            for name in manifest["projects"]:
+                with open(os.path.join(self.directory, name), "r", encoding="utf-8") as f:
+                    texts[name] = f.read()
+                projects.append(json.loads(texts[name]))
+            data["projects"] = projects
+        self._texts = texts
+        return data
+
+    def save(self, data: dict, project_fragments: list[str] | None = None,
+             ids: list[str] | None = None) -> list[str]:
+        """
+        Écrit les shards dont le contenu a changé, le manifest s'il a changé,
+        et supprime les shards des projets disparus.
+        Avec `project_fragments` et `ids` (voir FragmentCache), data["projects"]
+        n'est pas relu.
+        Retourne les noms des fichiers écrits.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        if project_fragments is None:
+            projects = data.get("projects", [])
+            project_fragments = [dump_project(p) for p in projects]
+            ids = [p.get("id", "") for p in projects]
+        names = shard_names(ids)
+        texts = dict(zip(names, project_fragments))
+        texts[MANIFEST_NAME] = json.dumps({
+            "keys": list(data.keys()),
+            "fields": {k: v for k, v in data.items() if k != "projects"},
+            "projects": names,
+        }, ensure_ascii=False, indent=2)
+
+        written = []
+        for name, text in texts.items():
+            old = self._texts[name] if name in self._texts else self._read(name)
+            if old == text:
+                continue
+            write_text_atomic(os.path.join(self.directory, name), text)
+            written.append(name)
+        for name in self._texts.keys() - texts.keys():
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+        self._texts = texts
+        return written
+
+    def _read(self, name: str) -> str | None:
+        # Shard not loaded by this store: compare against the file on disk
+        try:
+            with open(os.path.join(self.directory, name), "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def bundle_text(self, data: dict) -> str:
+        """Texte de projects-data.js, par concaténation des shards en mémoire."""
+        names = json.loads(self._texts[MANIFEST_NAME])["projects"]
+        return assemble_projects_js(data, [self._texts[name] for name in names])
+
+    def bundle_hash(self, path=PROJECTS_JSON) -> str | None:
+        """Hash du dernier bundle écrit par ce store à `path`."""
+        return self._bundle_hashes.get(str(path))
+
+    def remember_bundle(self, digest: str | None, path=PROJECTS_JSON):
+        """
+        Note `digest` (file_hash) comme hash du bundle présent à `path`, par
+        ex. juste après load() : un bundle identique n'est pas réécrit.
+        """
+        if digest is None:
+            self._bundle_hashes.pop(str(path), None)
+        else:
+            self._bundle_hashes[str(path)] = digest
+
+    def write_bundle(self, data: dict, path=PROJECTS_JSON) -> bool:
+        """Réécrit le bundle si son contenu a changé depuis la dernière écriture."""
+        text = self.bundle_text(data)
+        digest = content_hash(text)
+        if self._bundle_hashes.get(str(path)) == digest:
+            return False
+        write_text_atomic(path, text)
+        self._bundle_hashes[str(path)] = digest
+        return True
@@ -0,0 +1,56 @@
+"""
+Rafraîchissement incrémental de l'index des assets (AssetIndex).
+
+    python -m unittest discover -s editor/tests
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from asset_index import AssetIndex  # noqa: E402
+
+
+class RefreshTest(unittest.TestCase):
+    def setUp(self):
+        self.base = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.base)
+        os.makedirs(os.path.join(self.base, "assets", "a"))
+        self.path = os.path.join(self.base, "assets", "a", "x.png")
+        with open(self.path, "wb") as f:
+            f.write(b"1")
+        self.index = AssetIndex(os.path.join(self.base, "assets"), self.base)
+        self.index.refresh()
+
+    def test_unchanged_tree(self):
+        self.assertEqual(self.index.refresh(), 0)
+        self.assertEqual(self.index.get("assets/a/x.png").size, 1)
+
+    def test_file_rewritten_in_place(self):
+        # Same name in the same directory: the directory mtime does not move
+        with open(self.path, "r+b") as f:
+            f.write(b"12345")
+        self.assertEqual(self.index.refresh(), 1)
+        self.assertEqual(self.index.get("assets/a/x.png").size, 5)
+
+    def test_file_added(self):
+        with open(os.path.join(self.base, "assets", "a", "y.png"), "wb") as f:
+            f.write(b"22")
+        self.assertEqual(self.index.lookup("assets/a/y.png", fresh=True), "assets/a/y.png")
+
+    def test_restored_state(self):
+        # A state saved by another process (scan cache) is refreshed, not trusted
+        with open(self.path, "r+b") as f:
+            f.write(b"123")
+        index = AssetIndex(os.path.join(self.base, "assets"), self.base)
+        index.restore(self.index.state())
+        index.refresh()
+        self.assertEqual(index.get("assets/a/x.png").size, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
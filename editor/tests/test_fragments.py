@@ -0,0 +1,120 @@
+"""
+Le fichier assemblé à partir des fragments (FragmentCache) doit rester
+identique octet pour octet à dump_projects_js après chaque sorte de
+modification.
+
+    python -m unittest discover -s editor/tests
+"""
+
+import copy
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import FragmentCache, dump_projects_js, iter_assembled_projects_js  # noqa: E402
+from model import to_model  # noqa: E402
+
+
+def sample_data() -> dict:
+    return {
+        "version": 1,
+        "projects": [
+            {
+                "id": "regain",
+                "title": "Regain « The World »",
+                "media": "assets/projects/a/cover.png",
+                "medias": ["assets/projects/a/1.png", "assets/projects/a/2.mp4"],
+                "sections": [{"title": "Proto", "description": "ligne 1\nligne 2", "medias": []}],
+            },
+            {"id": "vide", "title": "", "sections": []},
+            {"id": "emoji", "title": "Jeu 🎮", "tags": ["c", "unity"], "meta": {"annee": 2022, "note": None}},
+        ],
+        "extra": {"liste": [1, 2], "vide": {}},
+    }
+
+
+class FragmentAssemblyTest(unittest.TestCase):
+    def setUp(self):
+        self.data = sample_data()
+        self.cache = FragmentCache()
+        self.assertAssembled()  # warm the cache
+
+    def assertAssembled(self):
+        fragments = self.cache.fragments(self.data.get("projects", []))
+        text = "".join(iter_assembled_projects_js(self.data, fragments))
+        self.assertEqual(text, dump_projects_js(self.data))
+
+    def test_unchanged(self):
+        self.assertAssembled()
+
+    def test_field(self):
+        proj = self.data["projects"][0]
+        proj["title"] = 'Titre é\n"x"'
+        self.cache.touch(proj)
+        self.assertAssembled()
+
+    def test_section(self):
+        proj = self.data["projects"][1]
+        proj["sections"].append({"title": "S", "description": "", "medias": ["a/b.png"]})
+        self.cache.touch(proj)
+        self.assertAssembled()
+
+    def test_add(self):
+        proj = {"id": "nouveau", "title": "Nouveau projet", "sections": []}
+        self.cache.touch(proj)
+        self.data["projects"].insert(1, proj)
+        self.assertAssembled()
+
+    def test_duplicate(self):
+        clone = copy.deepcopy(self.data["projects"][0])
+        self.cache.touch(clone)
+        self.data["projects"].insert(1, clone)
+        self.assertAssembled()
+
+    def test_delete(self):
+        del self.data["projects"][0]
+        self.assertAssembled()
+
+    def test_delete_all(self):
+        self.data["projects"].clear()
+        self.assertAssembled()
+
+    def test_move(self):
+        projects = self.data["projects"]
+        projects.append(projects.pop(0))
+        self.assertAssembled()
+
+    def test_meta(self):
+        self.data["version"] = 2
+        self.data["extra"]["liste"].append({"k": "é"})
+        self.assertAssembled()
+
+    def test_model_nodes(self):
+        # The editor keeps its projects as copy-on-write model nodes
+        self.data = to_model(self.data)
+        self.cache.clear()
+        self.assertAssembled()
+        proj = self.data["projects"][0].copy()
+        proj["title"] = "Modifié"
+        self.data["projects"][0] = proj
+        self.assertAssembled()
+
+    def test_untouched_projects_reuse_fragments(self):
+        before = self.cache.fragments(self.data["projects"])
+        self.data["projects"][2]["title"] = "Changé"
+        self.cache.touch(self.data["projects"][2])
+        after = self.cache.fragments(self.data["projects"])
+        self.assertIs(after[0], before[0])
+        self.assertIs(after[1], before[1])
+        self.assertIsNot(after[2], before[2])
+
+    def test_empty_data(self):
+        for self.data in ({}, {"projects": []}, {"meta": {"a": [1, {}]}, "projects": [], "z": None}):
+            with self.subTest(data=self.data):
+                self.assertAssembled()
+
+
+if __name__ == "__main__":
+    unittest.main()
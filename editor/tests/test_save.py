@@ -0,0 +1,111 @@
+"""
+Un enregistrement sans modification après un chargement ne réécrit pas
+projects-data.js (ni le bundle des shards) : l'éditeur part du hash du
+fichier lu.
+
+    python -m unittest discover -s editor/tests
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import core  # noqa: E402
+from core import FragmentCache, snapshot  # noqa: E402
+from history import History  # noqa: E402
+from journal import Journal  # noqa: E402
+from shards import ShardStore  # noqa: E402
+from validation import ProjectValidator  # noqa: E402
+
+try:
+    import editor
+except ImportError:  # tkinter / customtkinter missing
+    editor = None
+
+
+class _Saver:
+    def wait(self):
+        pass
+
+
+class _Editor:
+    """Juste ce que load_json et _write_snapshot utilisent, sans fenêtre Tk."""
+
+    def __init__(self, tmp: str, shards_dir: str):
+        self.shards = ShardStore(shards_dir)
+        self.journal = Journal(os.path.join(tmp, "journal.jsonl"))
+        self.saver = _Saver()
+        self.fragments = FragmentCache()
+        self.history = History()
+        self.validator = ProjectValidator()
+        self._recover_journal = lambda base: []
+
+    def _confirm_discard_changes(self):
+        return True
+
+    def _drop_views(self, proj=None):
+        pass
+
+    def refresh_projects_list(self, select: int = 0):
+        pass
+
+
+@unittest.skipIf(editor is None, "tkinter/customtkinter requis pour importer l'éditeur")
+class SaveWithoutEditsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.path = os.path.join(self.tmp, "projects-data.js")
+        shutil.copyfile(core.PROJECTS_JSON, self.path)
+        cache_dir = os.path.join(self.tmp, "cache")
+        for patch in (
+            mock.patch.object(editor, "PROJECTS_JSON", self.path),
+            mock.patch.object(editor, "load_projects_cached",
+                              lambda path: core.load_projects_cached(path, cache_dir)),
+        ):
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def load_and_save(self, shards_dir: str) -> bool:
+        app = _Editor(self.tmp, shards_dir)
+        editor.ProjectsEditor.load_json(app)
+        projects = app.data.get("projects", [])
+        fragments = app.fragments.fragments(projects)
+        ids = [p.get("id", "") for p in projects]
+        changed, digest = editor.ProjectsEditor._write_snapshot(app, snapshot(app.data), fragments, ids)
+        self.assertEqual(digest, core.file_hash(self.path))
+        return changed
+
+    def assertUntouched(self, shards_dir: str):
+        # Back-date the file: a rewrite would show even on coarse clocks
+        os.utime(self.path, ns=(0, 0))
+        self.assertFalse(self.load_and_save(shards_dir))
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 0)
+
+    def test_single_file(self):
+        self.assertUntouched(os.path.join(self.tmp, "absent"))
+
+    def test_shards(self):
+        shards_dir = os.path.join(self.tmp, "shards")
+        ShardStore(shards_dir).save(core.load_projects_file(self.path))
+        self.assertUntouched(shards_dir)
+
+    def test_edited_file_is_written(self):
+        app = _Editor(self.tmp, os.path.join(self.tmp, "absent"))
+        editor.ProjectsEditor.load_json(app)
+        app.data["projects"][0]["title"] = "Modifié"
+        app.fragments.touch(app.data["projects"][0])
+        projects = app.data["projects"]
+        changed, _ = editor.ProjectsEditor._write_snapshot(
+            app, snapshot(app.data), app.fragments.fragments(projects), [p.get("id", "") for p in projects])
+        self.assertTrue(changed)
+        self.assertIn("Modifié", core.load_projects_file(self.path)["projects"][0]["title"])
+
+
+if __name__ == "__main__":
+    unittest.main()
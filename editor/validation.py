@@ -0,0 +1,166 @@
+"""
+Validation incrémentale des projets : champs obligatoires, ids uniques,
+titres vides, fichiers de médias introuvables et balisage [url]/[enum] des
+descriptions mal formé (tel que l'interprète assets/js/script.js).
+
+ProjectValidator garde le résultat de chaque projet et un index id → projets ;
+seuls les projets modifiés depuis (touch()) ou nouveaux sont revalidés.
+"""
+
+import re
+
+from core import ASSET_INDEX, iter_media_paths
+from model import Node
+
+# Keys written by default_project(), with their JSON type
+REQUIRED_FIELDS = {
+    "id": str,
+    "title": str,
+    "category": str,
+    "icon": str,
+    "media": str,
+    "description": str,
+    "sections": list,
+    "medias": list,
+}
+
+# Same patterns as parseDescription / bbcodeInlinePreserve in script.js
+_ENUM_LINE_RE = re.compile(r"^\s*\[enum=(\d+)\](.*?)\[/enum\]\s*$", re.IGNORECASE)
+_ENUM_TAG_RE = re.compile(r"\[/?enum\b", re.IGNORECASE)
+_URL_RE = re.compile(r"\[url=(.+?)\](.+?)\[/url\]", re.IGNORECASE)
+_URL_TAG_RE = re.compile(r"\[/?url\b", re.IGNORECASE)
+_HREF_OK_RE = re.compile(r"^(https?://|/)", re.IGNORECASE)
+
+
+def check_markup(text: str, where: str) -> list[str]:
+    """Erreurs de balisage [url]/[enum] d'une description."""
+    errors = []
+    for n, line in enumerate(str(text).replace("\r\n", "\n").split("\n"), 1):
+        if _ENUM_TAG_RE.search(line) and not _ENUM_LINE_RE.match(line):
+            errors.append(f"{where}, ligne {n} : [enum=N]...[/enum] doit occuper toute la ligne")
+        for m in _URL_RE.finditer(line):
+            if not _HREF_OK_RE.match(m.group(1).strip()):
+                errors.append(f"{where}, ligne {n} : lien [url] invalide (http://, https:// ou /) : {m.group(1)}")
+        rest = _URL_RE.sub("", line)
+        if _URL_TAG_RE.search(rest):
+            errors.append(f"{where}, ligne {n} : balise [url=...]...[/url] mal formée")
+    return errors
+
+
+def _is_object(value) -> bool:
+    # JSON object as loaded (dict) or as kept by the editor (model node)
+    return isinstance(value, (dict, Node))
+
+
+def check_project(project) -> list[str]:
+    """Erreurs propres à un projet (hors unicité de l'id)."""
+    if not _is_object(project):
+        return [f"projet : type {type(project).__name__} au lieu d'un objet"]
+    errors = []
+    for key, kind in REQUIRED_FIELDS.items():
+        if key not in project:
+            errors.append(f"champ manquant : {key}")
+        elif not isinstance(project[key], kind):
+            errors.append(f"{key} : type {type(project[key]).__name__} au lieu de {kind.__name__}")
+    if isinstance(project.get("id"), str) and not project["id"].strip():
+        errors.append("id vide")
+    if isinstance(project.get("title"), str) and not project["title"].strip():
+        errors.append("titre vide")
+
+    if isinstance(project.get("description"), str):
+        errors += check_markup(project["description"], "description")
+    sections = project.get("sections", [])
+    # iter_media_paths needs lists of sections (objects) and of medias
+    well_formed = isinstance(sections, list) and isinstance(project.get("medias", []), list)
+    for j, sec in enumerate(sections if isinstance(sections, list) else []):
+        if not _is_object(sec):
+            errors.append(f"sections[{j}] : type {type(sec).__name__} au lieu d'un objet")
+            well_formed = False
+            continue
+        if not isinstance(sec.get("medias", []), list):
+            errors.append(f"sections[{j}].medias : type {type(sec['medias']).__name__} au lieu de list")
+            well_formed = False
+        if not str(sec.get("title", "")).strip():
+            errors.append(f"sections[{j}] : titre vide")
+        if isinstance(sec.get("description"), str):
+            errors += check_markup(sec["description"], f"sections[{j}].description")
+
+    if well_formed:
+        for where, path in iter_media_paths(project):
+            if path and ASSET_INDEX.lookup(path) is None:
+                errors.append(f"{where} : fichier introuvable dans ./assets : {path}")
+    return errors
+
+
+class ProjectValidator:
+    """
+    Résultats de validation par projet, recalculés seulement pour les
+    projets touchés (touch()) ou nouveaux. L'index id → projets donne les
+    doublons sans reparcourir les données.
+    """
+
+    def __init__(self):
+        # id(project) -> version, bumped by touch()
+        self._versions: dict[int, int] = {}
+        # id(project) -> (project, version, project id, own errors)
+        self._entries: dict[int, tuple[dict, int, str, list[str]]] = {}
+        # project id -> number of projects using it
+        self._ids: dict[str, int] = {}
+        self._last: list[list[str]] = []
+
+    def has_id(self, project_id: str) -> bool:
+        """True si un projet validé porte cet id."""
+        return project_id in self._ids
+
+    def touch(self, project):
+        self._versions[id(project)] = self._versions.get(id(project), 0) + 1
+
+    def clear(self):
+        self._versions.clear()
+        self._entries.clear()
+        self._ids.clear()
+        self._last = []
+
+    def _index(self, project_id, delta: int):
+        if not isinstance(project_id, str):
+            return  # wrong type, reported by check_project
+        count = self._ids.get(project_id, 0) + delta
+        if count > 0:
+            self._ids[project_id] = count
+        else:
+            self._ids.pop(project_id, None)
+
+    def validate(self, projects: list) -> tuple[list[list[str]], list[int]]:
+        """
+        Erreurs de chaque projet de `projects` (dans l'ordre), et positions
+        dont la liste d'erreurs a changé depuis l'appel précédent.
+        """
+        entries = {}
+        for proj in projects:
+            key = id(proj)
+            version = self._versions.get(key, 0)
+            entry = self._entries.pop(key, None)
+            if entry is not None and entry[0] is proj and entry[1] == version:
+                entries[key] = entry
+                continue
+            if entry is not None:
+                self._index(entry[2], -1)
+            project_id = proj.get("id") if _is_object(proj) else None
+            self._index(project_id, +1)
+            entries[key] = (proj, version, project_id, check_project(proj))
+        # Projects no longer in the list
+        for entry in self._entries.values():
+            self._index(entry[2], -1)
+        self._entries = entries
+        self._versions = {k: v for k, v in self._versions.items() if k in entries}
+
+        result, changed = [], []
+        for i, proj in enumerate(projects):
+            _, _, project_id, errors = entries[id(proj)]
+            if isinstance(project_id, str) and self._ids.get(project_id, 0) > 1:
+                errors = [f"id en double : {project_id}", *errors]
+            result.append(errors)
+            if i >= len(self._last) or self._last[i] != errors:
+                changed.append(i)
+        self._last = result
+        return result, changed